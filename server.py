@@ -1,9 +1,9 @@
+import asyncio
 import os
 import sys
 import threading
 import socket
-import time
-import subprocess
+from concurrent.futures import Future
 from typing import Optional
 
 # ComfyUI server (aiohttp) hooks
@@ -11,35 +11,51 @@ from server import PromptServer
 
 
 _LOCK = threading.Lock()
-_THREAD: Optional[threading.Thread] = None
+# Resolves once Gradio is listening (or fails with the startup error)
+_READY: Optional[Future] = None
+_OUTPUT_DIR_READY = False
+# Payload for /webui-generator/info, fixed once the port has been picked
+_INFO: Optional[dict] = None
 
 # You can change this if you want
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 7860
 
+# ComfyUI's output folder; sys.argv[0] is ComfyUI's main.py and won't change
+_COMFY_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "output")
 
-def _is_port_open(host: str, port: int, timeout: float = 0.25) -> bool:
+
+def _can_bind(host: str, port: int) -> bool:
+    # A port is usable if we can bind it; no network round trip needed
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
-        with socket.create_connection((host, port), timeout=timeout):
-            return True
-    except Exception:
+        # Lets us take a port still in TIME_WAIT, like the real server will.
+        # On Windows the same flag allows binding over a live listener, so
+        # it would make every port look free there.
+        if not sys.platform.startswith("win"):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind((host, port))
+        return True
+    except OSError:
         return False
+    finally:
+        s.close()
 
 
 def _pick_port(host: str, preferred: int) -> int:
     # If preferred is free, use it. Otherwise scan a small range.
-    if not _is_port_open(host, preferred):
+    if _can_bind(host, preferred):
         return preferred
     for p in range(preferred + 1, preferred + 50):
-        if not _is_port_open(host, p):
+        if _can_bind(host, p):
             return p
     return preferred
 
 
-def _run_gradio_server(host: str, port: int):
+def _run_gradio_server(host: str, port: int, ready: Future):
     """
     Runs your existing workflow_to_html_generator.py Gradio app
-    inside this ComfyUI process (thread).
+    inside this ComfyUI process (thread), then resolves `ready`.
     """
     try:
         # Import your file that you copied into this custom node folder
@@ -60,48 +76,77 @@ def _run_gradio_server(host: str, port: int):
             inbrowser=False,
             prevent_thread_lock=True,
         )
+        ready.set_result(None)
     except Exception as e:
         print(f"[WebUI-Generator-Node] Failed to start generator: {e}", file=sys.stderr)
+        ready.set_exception(e)
+
+
+def _started(ready: Optional[Future]) -> bool:
+    # Starting or running; a failed start may be retried
+    return ready is not None and not (ready.done() and ready.exception() is not None)
 
 
-def ensure_generator_running():
+def ensure_generator_running() -> Future:
     """
-    Starts the generator once (idempotent).
+    Starts the generator once (idempotent). Returns a future that resolves
+    when it is listening.
     """
-    global _THREAD
+    global _READY, _INFO
+
+    # Fast path without the lock; reading the global is atomic
+    ready = _READY
+    if _started(ready):
+        return ready
 
     with _LOCK:
-        if _THREAD and _THREAD.is_alive():
-            return
+        if _started(_READY):
+            return _READY
 
         host = os.environ.get("COMFY_WEBUI_GEN_HOST", DEFAULT_HOST)
         preferred_port = int(os.environ.get("COMFY_WEBUI_GEN_PORT", str(DEFAULT_PORT)))
         port = _pick_port(host, preferred_port)
 
         os.environ["COMFY_WEBUI_GEN_EFFECTIVE_PORT"] = str(port)
+        _INFO = {"host": host, "port": port, "url": f"http://{host}:{port}"}
 
-        t = threading.Thread(
+        # launch() returns once the server is up (prevent_thread_lock), so
+        # this thread exits early; the future is what tracks the server
+        ready = Future()
+        threading.Thread(
             target=_run_gradio_server,
-            args=(host, port),
+            args=(host, port, ready),
             daemon=True,
             name="ComfyUI-WebUI-Generator-Gradio",
-        )
-        t.start()
-        _THREAD = t
+        ).start()
+        _READY = ready
+        return ready
+
+
+def _spawn_opener(command: str):
+    def _open(path: str):
+        # Only needed once someone actually clicks "open folder"
+        import subprocess
+
+        subprocess.Popen([command, path])
+
+    return _open
+
+
+# Picked once at import; the platform can't change while we're running
+if sys.platform.startswith("win"):
+    _open_path = os.startfile  # type: ignore[attr-defined]
+elif sys.platform == "darwin":
+    _open_path = _spawn_opener("open")
+else:
+    _open_path = _spawn_opener("xdg-open")
 
 
 def _open_path_in_explorer(path: str):
     """
     Cross-platform folder open.
     """
-    path = os.path.abspath(path)
-
-    if sys.platform.startswith("win"):
-        os.startfile(path)  # type: ignore[attr-defined]
-    elif sys.platform == "darwin":
-        subprocess.Popen(["open", path])
-    else:
-        subprocess.Popen(["xdg-open", path])
+    _open_path(os.path.abspath(path))
 
 
 # -------------------------
@@ -110,14 +155,17 @@ def _open_path_in_explorer(path: str):
 
 @PromptServer.instance.routes.get("/webui-generator/info")
 async def webui_generator_info(request):
-    ensure_generator_running()
-    host = os.environ.get("COMFY_WEBUI_GEN_HOST", DEFAULT_HOST)
-    port = os.environ.get("COMFY_WEBUI_GEN_EFFECTIVE_PORT", str(DEFAULT_PORT))
-    return PromptServer.instance.json_response({
-        "host": host,
-        "port": int(port),
-        "url": f"http://{host}:{port}"
-    })
+    ready = ensure_generator_running()
+    # Don't hand out the URL before Gradio has bound the port
+    try:
+        # shield: timing out here must not cancel the shared future
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(ready)), timeout=30)
+    except Exception as e:
+        return PromptServer.instance.json_response(
+            {**_INFO, "ok": False, "error": str(e) or "Generator is still starting"},
+            status=503,
+        )
+    return PromptServer.instance.json_response(_INFO)
 
 
 @PromptServer.instance.routes.post("/webui-generator/open-output")
@@ -125,11 +173,19 @@ async def webui_generator_open_output(request):
     """
     Opens ComfyUI's output dir (or a custom one if you want later).
     """
+    global _OUTPUT_DIR_READY
+
     try:
-        comfy_root = os.path.dirname(os.path.abspath(sys.argv[0]))
-        output_dir = os.path.join(comfy_root, "output")
-        os.makedirs(output_dir, exist_ok=True)
-        _open_path_in_explorer(output_dir)
+        output_dir = _COMFY_OUTPUT_DIR
+        # Only needs creating once per process
+        if not _OUTPUT_DIR_READY:
+            os.makedirs(output_dir, exist_ok=True)
+            _OUTPUT_DIR_READY = True
+        # Spawning the file browser forks/blocks; keep it off the event loop
+        # but wait for it, so a missing opener is reported to the caller
+        await asyncio.get_running_loop().run_in_executor(
+            None, _open_path_in_explorer, output_dir
+        )
         return PromptServer.instance.json_response({"ok": True, "path": output_dir})
     except Exception as e:
         return PromptServer.instance.json_response({"ok": False, "error": str(e)}, status=500)
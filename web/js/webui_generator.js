@@ -7,7 +7,9 @@ function addButtons(node) {
 
   node.addWidget("button", "Open Generator UI", null, async () => {
     try {
-      const info = await api.fetchApi("/webui-generator/info").then(r => r.json());
+      const res = await api.fetchApi("/webui-generator/info");
+      const info = await res.json();
+      if (!res.ok) throw new Error(info.error || `HTTP ${res.status}`);
       const host = info.host || "127.0.0.1";
       const port = info.port || 7860;
 
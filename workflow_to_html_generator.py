@@ -3,14 +3,67 @@
 Professional-grade HTML interface generator with modern UI/UX
 """
 
+import contextlib
 import gradio as gr
+import hashlib
 import json
+import mmap
+import os
+import re
 import requests
+import struct
+import zlib
+from requests.adapters import HTTPAdapter
 import logging
+import logging.handlers
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
 from pathlib import Path
 import traceback
+from collections import defaultdict
+from functools import lru_cache
+from html import escape
+
+# orjson is optional: a faster drop-in for json.loads that also accepts bytes
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        """Serialize to UTF-8 bytes with sorted keys"""
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+    def _dumps_js(obj) -> str:
+        """Compact JSON text for the generated page's script. "<" is
+        escaped so a value can never close the <script> element."""
+        return orjson.dumps(obj).decode("utf-8").replace("<", "\\u003c")
+
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        """Serialize to UTF-8 bytes with sorted keys"""
+        return json.dumps(obj, sort_keys=True).encode("utf-8")
+
+    def _dumps_js(obj) -> str:
+        """Compact JSON text for the generated page's script. "<" is
+        escaped so a value can never close the <script> element."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).replace(
+            "<", "\\u003c"
+        )
+
+# ijson is optional: lets /object_info be parsed as it streams in
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# brotli is optional: only needed for the .br page copies
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Configure logging with UTF-8 encoding for Windows
 import sys
@@ -21,16 +74,385 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
+_LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+
+# The log file is written in batches instead of flushed per record: records
+# are held until 256 pile up or a WARNING+ arrives (and at exit). It's opened
+# lazily and rotated so it can't grow without bound.
+_file_handler = logging.handlers.RotatingFileHandler(
+    "generator.log",
+    maxBytes=5_000_000,
+    backupCount=2,
+    encoding="utf-8",
+    delay=True,
+)
+_file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s",
+    format=_LOG_FORMAT,
     handlers=[
-        logging.FileHandler("generator.log", encoding="utf-8"),
+        logging.handlers.MemoryHandler(
+            256, flushLevel=logging.WARNING, target=_file_handler
+        ),
         logging.StreamHandler(sys.stdout),
     ],
 )
 logger = logging.getLogger(__name__)
 
+_NOT_API_WORKFLOW = (
+    "Workflow must be a JSON object - export it from ComfyUI in API format"
+)
+
+# Also write <page>.html.gz next to each page, for web servers that serve
+# precompressed files (nginx gzip_static, Caddy precompressed, ...)
+_GZIP_COPY = bool(os.environ.get("COMFY_WEBUI_GEN_GZIP"))
+
+# Same for <page>.html.br. Brotli at quality 11 is slow to compress but
+# noticeably smaller than gzip, and it is paid once per generated page.
+_BROTLI_COPY = bool(os.environ.get("COMFY_WEBUI_GEN_BROTLI"))
+if _BROTLI_COPY and brotli is None:
+    logger.warning("COMFY_WEBUI_GEN_BROTLI is set but the brotli package is not installed")
+    _BROTLI_COPY = False
+
+# Link the stylesheet from a shared, content-hashed .css file next to the
+# pages instead of inlining it, so browsers can cache it across pages
+_EXTERNAL_CSS = bool(os.environ.get("COMFY_WEBUI_GEN_EXTERNAL_CSS"))
+
+# Debug mode: dump the fetched node definitions, and make generated pages
+# log per-item/per-parameter details to the browser console
+_DEBUG = bool(os.environ.get("COMFY_WEBUI_GEN_DEBUG"))
+
+# Model weight files get a file selector instead of a text box
+_MODEL_EXTS = frozenset({".safetensors", ".ckpt", ".gguf", ".pth", ".pt"})
+
+# Characters that can't appear in the generated HTML file name
+_SLUG_TABLE = str.maketrans({" ": "_", "/": "_"})
+
+
+# Category name -> element id: drop emojis (ours, and any in node titles
+# that end up in "🔧 <title>" categories, with their variation selectors
+# and joiners), then anything but word characters and "-" becomes "_".
+# Node titles are user text; the id also goes into quoted JS arguments, so
+# quotes and the like must not survive.
+_EMOJI_RE = re.compile("[\U0001F000-\U0001FAFF\u2600-\u27BF\uFE0F\u200D]+")
+_CAT_ID_UNSAFE_RE = re.compile(r"[^\w-]")
+
+
+@lru_cache(maxsize=256)
+def _slugify(name: str) -> str:
+    """Turn an app name into a file-name-safe stem"""
+    return name.translate(_SLUG_TABLE)
+
+
+def _load_json_file(path):
+    """Parse a JSON file, straight from a read-only mmap when orjson is available"""
+    with open(path, "rb") as f:
+        # Empty files can't be mapped; let the parser report them
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return _loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _read_node_defs(response) -> dict:
+    """Parse an /object_info response. With ijson it's parsed class by class
+    off the socket, keeping only each class's inputs - the rest (outputs,
+    display names, ...) is never used and can be many MB."""
+    if ijson is None:
+        return _loads(response.content)
+    response.raw.decode_content = True
+    return {
+        class_type: {"input": node_def.get("input") or {}}
+        for class_type, node_def in ijson.kvitems(response.raw, "", use_float=True)
+    }
+
+
+# O_SEQUENTIAL (Windows only) tells the cache manager the file is written
+# front to back. Passing it needs os.open; everywhere else it's 0 and the
+# output files are opened the plain way.
+_O_SEQUENTIAL = getattr(os, "O_SEQUENTIAL", 0)
+
+
+def _open_for_write(path):
+    """open(path, "wb"), with the sequential-access hint where there is one"""
+    # A page is ~100KB; a big buffer lets it go out in one or two writes
+    if not _O_SEQUENTIAL:
+        return open(path, "wb", buffering=1 << 20)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_BINARY | _O_SEQUENTIAL, 0o666)
+    try:
+        return open(fd, "wb", buffering=1 << 20)
+    except BaseException:
+        os.close(fd)
+        raise
+
+
+# gzip member header with no file name and a zero mtime: same page, same bytes
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+@lru_cache(maxsize=8)
+def _deflate_static(data: bytes) -> bytes:
+    """Raw deflate blocks for a static page fragment. The full flush leaves
+    them byte-aligned and not referring to anything before them, so they
+    can be compressed once and spliced into any page's gzip stream."""
+    c = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush(zlib.Z_FULL_FLUSH)
+
+
+def _write_chunks(path, chunks, gzip_copy: bool = False, brotli_copy: bool = False) -> int:
+    """Write page chunks as they come; returns the byte count. Chunks are
+    str, or bytes for the static parts that are encoded once at import.
+    The file is written under a temporary name and renamed into place, so
+    anything serving the folder never sees a half-written page. With
+    gzip_copy, a <path>.gz sidecar is compressed from the same chunks;
+    the static ones are only compressed the first time. brotli_copy adds
+    a <path>.br sidecar, streamed through one compressor."""
+    targets = [(f"{path}.tmp", path)]
+    if gzip_copy:
+        targets.append((f"{path}.gz.tmp", f"{path}.gz"))
+    if brotli_copy:
+        targets.append((f"{path}.br.tmp", f"{path}.br"))
+    size = 0
+    crc = 0
+    try:
+        with contextlib.ExitStack() as stack:
+            f = stack.enter_context(_open_for_write(targets[0][0]))
+            gz = None
+            if gzip_copy:
+                gz = stack.enter_context(_open_for_write(targets[1][0]))
+                gz.write(_GZIP_HEADER)
+                deflate = zlib.compressobj(6, zlib.DEFLATED, -15)
+            br = None
+            if brotli_copy:
+                br = stack.enter_context(_open_for_write(targets[-1][0]))
+                compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=11)
+            for chunk in chunks:
+                if type(chunk) is bytes:
+                    data = chunk
+                    size += f.write(data)
+                    if gz is not None:
+                        # Close off the dynamic run, then splice in the
+                        # fragment's blocks compressed at first use
+                        gz.write(deflate.flush(zlib.Z_FULL_FLUSH))
+                        gz.write(_deflate_static(data))
+                        crc = zlib.crc32(data, crc)
+                else:
+                    data = chunk.encode("utf-8")
+                    size += f.write(data)
+                    if gz is not None:
+                        gz.write(deflate.compress(data))
+                        crc = zlib.crc32(data, crc)
+                if br is not None:
+                    br.write(compressor.process(data))
+            if gz is not None:
+                gz.write(deflate.flush())
+                gz.write(struct.pack("<II", crc, size & 0xFFFFFFFF))
+            if br is not None:
+                br.write(compressor.finish())
+    except BaseException:
+        # Building the page failed part-way; keep the previous page and
+        # don't leave the partial one lying around
+        for tmp, _ in targets:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        raise
+    for tmp, final in targets:
+        os.replace(tmp, final)
+    return size
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+def _minify_css(css: str) -> str:
+    """Drop comments and layout whitespace from a stylesheet. Only used on
+    our own static CSS: there's no whitespace inside strings to protect, and
+    spaces before ':' are kept since "a :hover" differs from "a:hover"."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    css = css.replace(": ", ":").replace(";}", "}")
+    return css.strip() + "\n"
+
+
+@lru_cache(maxsize=128)
+def _category_skeleton(category: str) -> Tuple[str, str]:
+    """(bypass checkbox id, opening markup) of a category section. Only
+    depends on the name, so it's reused across generations."""
+    cat_id = _CAT_ID_UNSAFE_RE.sub("_", _EMOJI_RE.sub("", category))
+    bypass_id = f"bypass_{cat_id}"
+    return bypass_id, f'''
+<div class="category-section" id="section_{cat_id}">
+    <div class="category-header" onclick="toggleCategory('{cat_id}')">
+        <h3>{escape(category)}</h3>
+        <div class="category-controls">
+            <label class="bypass-toggle" title="Bypass this entire category">
+                <input type="checkbox" id="{bypass_id}" onchange="handleBypass('{bypass_id}')">
+                <span>Bypass</span>
+            </label>
+            <span class="collapse-icon" id="collapse_{cat_id}">▼</span>
+        </div>
+    </div>
+    <div class="category-content" id="content_{cat_id}">
+'''
+
+
+@lru_cache(maxsize=1024)
+def _param_id_prefix(node_id: str) -> str:
+    """Shared "param_<node>_" prefix of the ids of one node's inputs"""
+    return sys.intern(f"param_{node_id}_")
+
+
+_CATEGORY_CLOSE = """
+    </div>
+</div>
+"""
+
+# One labelled input in a category section of the generated page
+_PARAM_ROW_TMPL = """
+        <div class="form-group">
+            <label for="{pid}">{title} → {iname}{tip}</label>
+            {input_html}
+        </div>
+"""
+
+# Image/audio upload widget: upload button, a picker for files already in
+# ComfyUI's input folder ({select}, empty when there are none) and a preview
+_UPLOAD_WIDGET_TMPL = """
+                <div class="image-upload-widget">
+                    <div class="input-group mb-2">
+                        <input type="file" id="{pid}_file" class="form-control d-none" accept="{accept}" 
+                        data-kind="upload-file" data-param="{pid}" data-upload-type="{upload_type}">
+                        <button class="btn btn-outline-primary" type="button" onclick="document.getElementById('{pid}_file').click()">
+                            <i class="fas fa-upload"></i> Upload {upload_label}
+                        </button>
+                        {select}
+                    </div>
+                    {warning}
+                    <div id="{pid}_preview" class="image-preview-container mt-2" style="display: none;">
+                        {preview_img}
+                        {preview_audio}
+                    <button class="btn btn-sm btn-outline-danger mt-1" onclick="clearUpload('{pid}', '{upload_type}')">
+                            <i class="fas fa-times"></i> Clear
+                        </button>
+                    </div>
+                    <input type="hidden" id="{pid}_uploaded" value="">
+                </div>
+            """
+
+_UPLOAD_SELECT_TMPL = """<select id="{pid}" class="form-control" data-default="{value}" value="{selected_value}"
+                                data-kind="upload-select" data-upload-type="{upload_type}">
+                            <option value="" disabled {placeholder_selected}>Select existing {upload_type}...</option>
+                            {options}
+                        </select>"""
+
+_UPLOAD_MISSING_TMPL = (
+    '<div class="text-warning small mt-1">⚠️ Warning: Selected file "{value}" not found in input folder</div>'
+)
+_UPLOAD_PREVIEW_IMG_TMPL = (
+    '<img id="{pid}_preview_img" src="" alt="Preview" decoding="async"'
+    ' style="max-width: 200px; max-height: 150px; border-radius: 8px;">'
+)
+_UPLOAD_PREVIEW_AUDIO_TMPL = (
+    '<audio id="{pid}_preview_audio" controls style="width: 100%; margin-top: 10px;"></audio>'
+)
+
+
+def _options_html(options, value) -> str:
+    """<option> tags for a dropdown with `value` preselected. Model and LoRA
+    lists can run to hundreds of entries, so each option is converted to str
+    and escaped once and compared against a single str(value)."""
+    selected = str(value)
+    return "".join(
+        [
+            f'<option value="{esc}" selected>{esc}</option>'
+            if opt == selected
+            else f'<option value="{esc}" >{esc}</option>'
+            for opt in map(str, options)
+            for esc in (escape(opt),)
+        ]
+    )
+
+
+def _extract_options(input_def, section_name, class_type, input_name):
+    """Extract options from input definition with multiple format support.
+    Returns: (options_list, has_upload, upload_type)"""
+    if not isinstance(input_def, list):
+        return None, False, None
+
+    if len(input_def) == 0:
+        return None, False, None
+
+    verbose = logger.isEnabledFor(logging.INFO)
+    _has_img_upload_tmp = False
+    _has_aud_upload_tmp = False
+
+    # Check for image_upload flag in metadata (second element)
+    if len(input_def) > 1 and isinstance(input_def[1], dict):
+        _has_img_upload_tmp = input_def[1].get("image_upload", False)
+        _has_aud_upload_tmp = input_def[1].get("audio_upload", False)
+    if _has_img_upload_tmp and verbose:
+        logger.info(f"🖼️ {class_type}.{input_name} has image_upload support")
+    if _has_aud_upload_tmp and verbose:
+        logger.info(f"🔊 {class_type}.{input_name} has audio_upload support")
+    has_upload = bool(_has_img_upload_tmp or _has_aud_upload_tmp)
+    upload_type = (
+        "audio"
+        if _has_aud_upload_tmp
+        else ("image" if _has_img_upload_tmp else None)
+    )
+
+    # Format 1: COMBO widget - ["COMBO", {"options": [...]}]
+    if (
+        isinstance(input_def[0], str)
+        and len(input_def) > 1
+        and isinstance(input_def[1], dict)
+        and "options" in input_def[1]
+    ):
+        options = input_def[1]["options"]
+        if isinstance(options, list) and len(options) > 0:
+            if verbose:
+                logger.info(
+                    f"📋 {class_type}.{input_name} ({section_name}): {len(options)} options [COMBO]"
+                )
+            return options, has_upload, upload_type
+
+    # Format 2: [["option1", "option2", ...], {}] - list of options in first element
+    if isinstance(input_def[0], list) and len(input_def[0]) > 0:
+        options = input_def[0]
+        if all(isinstance(opt, str) for opt in options):
+            if verbose:
+                logger.info(
+                    f"📋 {class_type}.{input_name} ({section_name}): {len(options)} options [list]"
+                )
+            return options, has_upload, upload_type
+
+    # Format 3: [{"options": [...]}, {}] - nested options dict in first element
+    if isinstance(input_def[0], dict) and "options" in input_def[0]:
+        options = input_def[0]["options"]
+        if isinstance(options, list) and len(options) > 0:
+            if verbose:
+                logger.info(
+                    f"📋 {class_type}.{input_name} ({section_name}): {len(options)} options [nested]"
+                )
+            return options, has_upload, upload_type
+
+    # Format 4: Direct list of strings ["option1", "option2"]
+    if all(isinstance(opt, str) for opt in input_def):
+        if verbose:
+            logger.info(
+                f"📋 {class_type}.{input_name} ({section_name}): {len(input_def)} options [direct]"
+            )
+        return input_def, has_upload, upload_type
+
+    return None, has_upload, upload_type
+
 
 class SmartWorkflowGenerator:
     """Enhanced workflow generator with professional features"""
@@ -170,6 +592,34 @@ class SmartWorkflowGenerator:
         "crop_position": ["center", "top", "bottom", "left", "right"],
         "pix_fmt": ["yuv420p", "yuv422p", "yuv444p"],
     }
+    # Lowercased once so lookups are a single dict get plus one substring pass
+    _DROPDOWN_LOWER = {k.lower(): v for k, v in DROPDOWN_OPTIONS.items()}
+    _DROPDOWN_KEYS = tuple(_DROPDOWN_LOWER)
+
+    # categorize() rules, first match wins: (field, keywords, category) where
+    # field is 0 = class type, 1 = input name, 2 = class type or node title.
+    # "load" also covers "loader", "sample" covers "(k)sampler" and "scale"
+    # covers "upscale".
+    _CATEGORY_RULES = (
+        (0, ("load",), "📂 Loaders"),
+        (0, ("sample", "scheduler"), "⚙️ Sampling"),
+        (2, ("resolution",), "📐 Resolution"),
+        (0, ("condition", "encode"), "🎯 Conditioning"),
+        (1, ("seed", "noise"), "🎲 Seeds"),
+        (1, ("steps", "cfg", "denoise"), "⚡ Generation"),
+        (0, ("image", "resize", "scale"), "🖼️ Images"),
+        (0, ("video", "frame", "fps"), "🎬 Video"),
+        (2, ("batch",), "📦 Batch"),
+        (0, ("audio", "sound", "tts"), "🔊 Audio"),
+        (0, ("save", "output", "preview", "combine"), "💾 Output"),
+    )
+    # Loaders are split further by what they load
+    _LOADER_RULES = (
+        (("model", "checkpoint", "gguf"), "🤖 Models"),
+        (("vae",), "🎨 VAE"),
+        (("clip",), "📝 CLIP"),
+        (("lora",), "✨ LoRA"),
+    )
 
     # Hardcoded upload fields for nodes that don't have proper API flags
     UPLOAD_FIELDS = {
@@ -184,28 +634,44 @@ class SmartWorkflowGenerator:
     def __init__(self):
         self.workflow = None
         self.parameters = []
-        self.nodes_by_category = {}
+        self.nodes_by_category = defaultdict(set)
         self.node_defs = {}
         self.server_url = "http://127.0.0.1:8188"
+        # Output path -> (content key, mtime_ns, size) of the page last written there
+        self._html_cache = {}
+        # class_type -> {input_name: (options, has_upload, upload_type, description)}
+        self._input_index = {}
+        # (workflow, its JSON for the page script), reused until another
+        # workflow is loaded
+        self._workflow_json = None
+        # Keep-alive session so reloading a workflow reuses the connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         logger.info(f"🚀 Generator v{self.VERSION} initialized")
 
     def fetch_node_defs(self, server_url: str):
         """Fetch ALL node definitions from ComfyUI API"""
         try:
             logger.info(f"📡 Connecting to ComfyUI: {server_url}")
-            response = requests.get(f"{server_url}/object_info", timeout=10)
+            response = self.session.get(
+                f"{server_url}/object_info", timeout=10, stream=ijson is not None
+            )
 
             if response.status_code == 200:
-                self.node_defs = response.json()
+                self.node_defs = _read_node_defs(response)
+                self._input_index = {}
                 logger.info(f"✅ Fetched {len(self.node_defs)} node types from API")
 
-                # Debug: Save API response for inspection
-                try:
-                    with open("api_debug.json", "w", encoding="utf-8") as f:
-                        json.dump(self.node_defs, f, indent=2, ensure_ascii=False)
-                    logger.info("📝 Saved API response to api_debug.json")
-                except Exception as e:
-                    logger.warning(f"Could not save API debug: {e}")
+                # Debug: Save API response for inspection (can be many MB)
+                if _DEBUG:
+                    try:
+                        with open("api_debug.json", "wb") as f:
+                            f.write(_dumps(self.node_defs))
+                        logger.info("📝 Saved API response to api_debug.json")
+                    except Exception as e:
+                        logger.warning(f"Could not save API debug: {e}")
 
                 # Debug: Check for specific nodes
                 if "TextEncodeAceStepAudio1.5" in self.node_defs:
@@ -220,6 +686,7 @@ class SmartWorkflowGenerator:
                     f"✅ API Connected: {len(self.node_defs)} node types fetched",
                 )
 
+            response.close()
             logger.warning(f"⚠️ HTTP {response.status_code}")
             return False, f"⚠️ HTTP {response.status_code}"
 
@@ -242,159 +709,85 @@ class SmartWorkflowGenerator:
         """Extract dropdown options from ComfyUI API with enhanced parsing.
         Returns: (options_list, has_upload, upload_type)"""
         if class_type not in self.node_defs:
-            logger.debug(f"🔍 Node {class_type} not found in API definitions")
-            return None, False
+            logger.debug("🔍 Node %s not found in API definitions", class_type)
+            return None, False, None
 
         node_def = self.node_defs[class_type]
 
         # Debug: Log the node structure for specific nodes
         if "TextEncode" in class_type or "Audio" in class_type or "Ace" in class_type:
-            logger.info(f"🔍 Checking {class_type}.{input_name}")
+            logger.info("🔍 Checking %s.%s", class_type, input_name)
             if "input" in node_def:
-                logger.info(f"   Input sections: {list(node_def['input'].keys())}")
-
-        def extract_options(input_def, section_name):
-            """Extract options from input definition with multiple format support.
-            Returns: (options_list, has_upload, upload_type)"""
-            if not isinstance(input_def, list):
-                return None, False, None
-
-            if len(input_def) == 0:
-                return None, False, None
-
-            _has_img_upload_tmp = False
-            _has_aud_upload_tmp = False
-
-            # Check for image_upload flag in metadata (second element)
-            if len(input_def) > 1 and isinstance(input_def[1], dict):
-                _has_img_upload_tmp = input_def[1].get("image_upload", False)
-                _has_aud_upload_tmp = input_def[1].get("audio_upload", False)
-            if _has_img_upload_tmp:
-                logger.info(f"🖼️ {class_type}.{input_name} has image_upload support")
-            if _has_aud_upload_tmp:
-                logger.info(f"🔊 {class_type}.{input_name} has audio_upload support")
-
-            # Format 1: COMBO widget - ["COMBO", {"options": [...]}]
-            if (
-                isinstance(input_def[0], str)
-                and len(input_def) > 1
-                and isinstance(input_def[1], dict)
-                and "options" in input_def[1]
-            ):
-                options = input_def[1]["options"]
-                if isinstance(options, list) and len(options) > 0:
-                    logger.info(
-                        f"📋 {class_type}.{input_name} ({section_name}): {len(options)} options [COMBO]"
-                    )
-                    has_upload = _has_img_upload_tmp or _has_aud_upload_tmp
-                    upload_type = (
-                        "audio"
-                        if _has_aud_upload_tmp
-                        else ("image" if _has_img_upload_tmp else None)
-                    )
-                    return options, has_upload, upload_type
-
-            # Format 2: [["option1", "option2", ...], {}] - list of options in first element
-            if isinstance(input_def[0], list) and len(input_def[0]) > 0:
-                options = input_def[0]
-                if all(isinstance(opt, str) for opt in options):
-                    logger.info(
-                        f"📋 {class_type}.{input_name} ({section_name}): {len(options)} options [list]"
-                    )
-                    has_upload = _has_img_upload_tmp or _has_aud_upload_tmp
-                    upload_type = (
-                        "audio"
-                        if _has_aud_upload_tmp
-                        else ("image" if _has_img_upload_tmp else None)
-                    )
-                    return options, has_upload, upload_type
-
-            # Format 3: [{"options": [...]}, {}] - nested options dict in first element
-            if isinstance(input_def[0], dict) and "options" in input_def[0]:
-                options = input_def[0]["options"]
-                if isinstance(options, list) and len(options) > 0:
-                    logger.info(
-                        f"📋 {class_type}.{input_name} ({section_name}): {len(options)} options [nested]"
-                    )
-                    has_upload = _has_img_upload_tmp or _has_aud_upload_tmp
-                    upload_type = (
-                        "audio"
-                        if _has_aud_upload_tmp
-                        else ("image" if _has_img_upload_tmp else None)
-                    )
-                    return options, has_upload, upload_type
-
-            # Format 4: Direct list of strings ["option1", "option2"]
-            if all(isinstance(opt, str) for opt in input_def):
-                logger.info(
-                    f"📋 {class_type}.{input_name} ({section_name}): {len(input_def)} options [direct]"
-                )
-                has_upload = _has_img_upload_tmp or _has_aud_upload_tmp
-                upload_type = (
-                    "audio"
-                    if has_audio_upload
-                    else ("image" if _has_img_upload_tmp else None)
-                )
-                return input_def, has_upload, upload_type
-
-            has_upload = _has_img_upload_tmp or _has_aud_upload_tmp
-            upload_type = (
-                "audio"
-                if _has_aud_upload_tmp
-                else ("image" if _has_img_upload_tmp else None)
-            )
-            return None, has_upload, upload_type
-
-        # Check required inputs
-        if "input" in node_def:
-            inputs = node_def["input"]
+                logger.info("   Input sections: %s", list(node_def["input"]))
 
-            if "required" in inputs and input_name in inputs["required"]:
-                input_def = inputs["required"][input_name]
-                options, has_upload, upload_type = extract_options(
-                    input_def, "required"
-                )
-                if options or has_upload:
-                    return options, has_upload, upload_type
-
-            # Check optional inputs
-            if "optional" in inputs and input_name in inputs["optional"]:
-                input_def = inputs["optional"][input_name]
-                options, has_upload, upload_type = extract_options(
-                    input_def, "optional"
-                )
-                if options or has_upload:
-                    return options, has_upload, upload_type
-
-            # Check hidden inputs (some nodes put dropdowns here)
-            if "hidden" in inputs and input_name in inputs["hidden"]:
-                input_def = inputs["hidden"][input_name]
-                options, has_upload, upload_type = extract_options(input_def, "hidden")
-                if options or has_upload:
-                    return options, has_upload, upload_type
-
-        return None, False, None
+        entry = self._class_inputs(class_type).get(input_name)
+        return entry[:3] if entry else (None, False, None)
 
     def get_input_description(self, class_type: str, input_name: str) -> str:
         """Get parameter description from API for tooltips"""
         if class_type not in self.node_defs:
             return ""
 
-        node_def = self.node_defs[class_type]
+        entry = self._class_inputs(class_type).get(input_name)
+        return entry[3] if entry else ""
 
-        # Try to extract description if available
-        if "input" in node_def:
-            for section in ["required", "optional"]:
+    def get_input_limits(self, class_type: str, input_name: str) -> Optional[Dict]:
+        """min/max/step the API declares for a numeric input, if any"""
+        if class_type not in self.node_defs:
+            return None
+
+        entry = self._class_inputs(class_type).get(input_name)
+        return entry[4] if entry else None
+
+    def _class_inputs(self, class_type: str) -> Dict[str, Tuple]:
+        """Input index for a node class, built the first time the class is seen"""
+        index = self._input_index.get(class_type)
+        if index is None:
+            index = self._input_index[class_type] = self._index_class_inputs(class_type)
+        return index
+
+    def _index_class_inputs(self, class_type: str) -> Dict[str, Tuple]:
+        """Map every input of a node class to (options, has_upload, upload_type, description, limits)"""
+        inputs = self.node_defs[class_type].get("input") or {}
+        found = {}
+        tooltips = {}
+        limits = {}
+        for section in ("required", "optional", "hidden"):
+            section_inputs = inputs.get(section)
+            if not isinstance(section_inputs, dict):
+                continue
+            for name, input_def in section_inputs.items():
+                # First section that yields options or an upload flag wins
+                if name not in found:
+                    options, has_upload, upload_type = _extract_options(
+                        input_def, section, class_type, name
+                    )
+                    if options or has_upload:
+                        found[name] = (options, has_upload, upload_type)
+                # Tooltips and numeric limits only come from required/optional
                 if (
-                    section in node_def["input"]
-                    and input_name in node_def["input"][section]
+                    section == "hidden"
+                    or not isinstance(input_def, list)
+                    or len(input_def) < 2
+                    or not isinstance(input_def[1], dict)
                 ):
-                    input_def = node_def["input"][section][input_name]
-                    if isinstance(input_def, list) and len(input_def) > 1:
-                        if isinstance(input_def[1], dict) and "tooltip" in input_def[1]:
-                            return input_def[1]["tooltip"]
+                    continue
+                spec = input_def[1]
+                if name not in tooltips and "tooltip" in spec:
+                    tooltips[name] = spec["tooltip"]
+                if name not in limits:
+                    bounds = {
+                        key: spec[key]
+                        for key in ("min", "max", "step")
+                        if isinstance(spec.get(key), (int, float)) and not isinstance(spec[key], bool)
+                    }
+                    if bounds:
+                        limits[name] = bounds
 
-        return ""
+        return {
+            name: found.get(name, (None, False, None)) + (tooltips.get(name, ""), limits.get(name))
+            for name in found.keys() | tooltips.keys() | limits.keys()
+        }
 
     def load_workflow(self, file, server_url="http://127.0.0.1:8188") -> Tuple:
         """Load and analyze workflow with full API integration"""
@@ -414,29 +807,47 @@ class SmartWorkflowGenerator:
 
             # STEP 2: Load workflow
             logger.info("STEP 2: Loading workflow JSON...")
-            if hasattr(file, "name"):
-                with open(file.name, "r", encoding="utf-8") as f:
-                    self.workflow = json.load(f)
+            # Gradio hands over a tempfile wrapper or a plain .json path; any
+            # other string is handed to the parser without touching the
+            # filesystem
+            path = getattr(file, "name", None)
+            if (
+                path is None
+                and isinstance(file, str)
+                and file.lstrip()[:1] not in ("{", "[")
+                and file.rstrip().lower().endswith(".json")
+            ):
+                path = file.strip()
+            if path is not None:
+                self.workflow = _load_json_file(path)
             else:
                 if file is None:
                     return None, "❌ No file uploaded", []
-                self.workflow = json.loads(
-                    file.decode("utf-8") if isinstance(file, bytes) else file
-                )
+                # API workflows are always a JSON object; reject anything
+                # else before paying for a full parse
+                if file.lstrip()[:1] not in ("{", b"{"):
+                    raise ValueError(_NOT_API_WORKFLOW)
+                # Both parsers take bytes directly and skip whitespace
+                # themselves, so no decode/strip pass beforehand
+                self.workflow = _loads(file)
+
+            if not isinstance(self.workflow, dict):
+                raise ValueError(_NOT_API_WORKFLOW)
 
             logger.info(f"✅ Loaded workflow with {len(self.workflow)} nodes")
 
             # STEP 3: Extract parameters
             logger.info("STEP 3: Analyzing parameters...")
             self.parameters = []
-            self.nodes_by_category = {}
+            self.nodes_by_category = defaultdict(set)
 
+            verbose = logger.isEnabledFor(logging.INFO)
             for node_id, node_data in self.workflow.items():
                 class_type = node_data.get("class_type", "")
                 inputs = node_data.get("inputs", {})
                 title = node_data.get("_meta", {}).get("title", class_type)
 
-                logger.debug(f"🔍 Node {node_id}: {class_type} ({title})")
+                logger.debug("🔍 Node %s: %s (%s)", node_id, class_type, title)
 
                 for input_name, input_value in inputs.items():
                     # Skip connections
@@ -448,16 +859,23 @@ class SmartWorkflowGenerator:
                         self.get_dropdown_options_from_api(class_type, input_name)
                     )
                     description = self.get_input_description(class_type, input_name)
+                    limits = self.get_input_limits(class_type, input_name)
 
                     # Log for debugging specific nodes
-                    if (
+                    if verbose and (
                         "TextEncode" in class_type
                         or "Audio" in class_type
                         or "language" in input_name.lower()
                         or has_upload
                     ):
                         logger.info(
-                            f"🔍 Processing: {class_type}.{input_name} - Options: {api_options is not None} ({len(api_options) if api_options else 0} items), Upload: {has_upload} ({upload_type})"
+                            "🔍 Processing: %s.%s - Options: %s (%d items), Upload: %s (%s)",
+                            class_type,
+                            input_name,
+                            api_options is not None,
+                            len(api_options) if api_options else 0,
+                            has_upload,
+                            upload_type,
                         )
 
                     # Fallback to hardcoded
@@ -490,24 +908,22 @@ class SmartWorkflowGenerator:
                         "options": api_options,
                         "category": category,
                         "description": description,
+                        "limits": limits,
                         "has_upload": has_upload or (detected_upload_type is not None),
                         "upload_type": final_upload_type,
                     }
 
                     self.parameters.append(param)
 
-                    if category not in self.nodes_by_category:
-                        self.nodes_by_category[category] = set()
                     self.nodes_by_category[category].add(node_id)
 
             # Build checkbox options
             options = []
-            for i, param in enumerate(self.parameters):
-                opts_info = (
-                    f" [{len(param['options'])} opts]" if param["options"] else ""
-                )
-                label = f"{param['category']} | {param['node_title']} → {param['input_name']} ({param['type']}{opts_info})"
+            for i, p in enumerate(self.parameters):
+                suffix = f" [{len(p['options'])} opts]" if p["options"] else ""
+                label = f"{p['category']} | {p['node_title']} → {p['input_name']} ({p['type']}{suffix})"
                 options.append((label, i))
+            all_selected = list(range(len(options)))
 
             logger.info("=" * 60)
             logger.info(f"✅ COMPLETE: {len(self.parameters)} parameters extracted")
@@ -519,9 +935,9 @@ class SmartWorkflowGenerator:
             info += f"📂 {len(self.nodes_by_category)} categories detected"
 
             return (
-                gr.update(choices=options, value=list(range(len(options)))),
+                gr.update(choices=options, value=all_selected),
                 info,
-                list(range(len(options))),
+                all_selected,
             )
 
         except Exception as e:
@@ -559,31 +975,40 @@ class SmartWorkflowGenerator:
             return "dropdown", None
 
         # Check hardcoded dropdown
-        if input_name in self.DROPDOWN_OPTIONS or name_lower in self.DROPDOWN_OPTIONS:
+        if name_lower in self._DROPDOWN_LOWER:
             return "dropdown", None
 
-        # Type detection from value
-        if isinstance(value, bool):
-            return "toggle", None
-        elif isinstance(value, int):
-            if "seed" in name_lower and value > 1000:
-                return "seed", None
-            return "number", None
-        elif isinstance(value, float):
-            return ("slider_small" if value <= 2.0 else "slider"), None
-        elif isinstance(value, str):
-            try:
-                float_val = float(value)
-                return ("slider_small" if float_val <= 2.0 else "slider"), None
-            except:
-                pass
+        # Type detection from value, on its exact JSON type
+        detect = self._TYPE_DISPATCH.get(type(value))
+        if detect is None:
+            # null / nested objects: nothing better than a plain text box
+            return "text", None
+        return detect(self, name_lower, value)
+
+    def _detect_bool(self, name_lower: str, value: bool):
+        return "toggle", None
+
+    def _detect_int(self, name_lower: str, value: int):
+        if "seed" in name_lower and value > 1000:
+            return "seed", None
+        return "number", None
+
+    def _detect_float(self, name_lower: str, value: float):
+        return ("slider_small" if value <= 2.0 else "slider"), None
 
+    def _detect_str(self, name_lower: str, value: str):
+        try:
+            float_val = float(value)
+            return ("slider_small" if float_val <= 2.0 else "slider"), None
+        except:
+            pass
+        return self._detect_text(name_lower, value)
+
+    def _detect_text(self, name_lower: str, value: str):
         if len(value) > 100 or "\n" in value:
             return "textarea", None
 
-        if any(
-            ext in value for ext in [".safetensors", ".ckpt", ".gguf", ".pth", ".pt"]
-        ):
+        if os.path.splitext(value)[1].lower() in _MODEL_EXTS:
             return "file_selector", None
 
         if "/" in value or "\\" in value:
@@ -591,18 +1016,23 @@ class SmartWorkflowGenerator:
 
         return "text", None
 
+    _TYPE_DISPATCH = {
+        bool: _detect_bool,
+        int: _detect_int,
+        float: _detect_float,
+        str: _detect_str,
+    }
+
     def get_dropdown_options(self, input_name: str) -> Optional[List[str]]:
         """Fallback to hardcoded dropdown options"""
-        if input_name in self.DROPDOWN_OPTIONS:
-            return self.DROPDOWN_OPTIONS[input_name]
-
         name_lower = input_name.lower()
-        if name_lower in self.DROPDOWN_OPTIONS:
-            return self.DROPDOWN_OPTIONS[name_lower]
+        options = self._DROPDOWN_LOWER.get(name_lower)
+        if options is not None:
+            return options
 
-        for key in self.DROPDOWN_OPTIONS.keys():
+        for key in self._DROPDOWN_KEYS:
             if key in name_lower:
-                return self.DROPDOWN_OPTIONS[key]
+                return self._DROPDOWN_LOWER[key]
 
         return None
 
@@ -610,58 +1040,24 @@ class SmartWorkflowGenerator:
         """Smart categorization with emoji icons"""
         class_lower = class_type.lower()
         input_lower = input_name.lower()
-        title_lower = title.lower()
-
-        if any(w in class_lower for w in ["loader", "load"]):
-            if (
-                "model" in class_lower
-                or "checkpoint" in class_lower
-                or "gguf" in class_lower
-            ):
-                return "🤖 Models"
-            if "vae" in class_lower:
-                return "🎨 VAE"
-            if "clip" in class_lower:
-                return "📝 CLIP"
-            if "lora" in class_lower:
-                return "✨ LoRA"
-            return "📂 Loaders"
-
-        if any(
-            w in class_lower for w in ["sampler", "ksampler", "sample", "scheduler"]
+        # Indexed by the first field of each _CATEGORY_RULES entry
+        fields = (class_lower, input_lower, f"{class_lower}\n{title.lower()}")
+
+        for where, words, category in self._CATEGORY_RULES:
+            if any(w in fields[where] for w in words):
+                break
+        else:
+            return f"🔧 {title}"
+
+        if category == "📂 Loaders":
+            for words, sub in self._LOADER_RULES:
+                if any(w in class_lower for w in words):
+                    return sub
+        elif category == "🎯 Conditioning" and (
+            "text" in class_lower or "prompt" in input_lower
         ):
-            return "⚙️ Sampling"
-
-        if "resolution" in class_lower or "resolution" in title_lower:
-            return "📐 Resolution"
-
-        if any(w in class_lower for w in ["condition", "encode"]):
-            if "text" in class_lower or "prompt" in input_lower:
-                return "📝 Prompts"
-            return "🎯 Conditioning"
-
-        if "seed" in input_lower or "noise" in input_lower:
-            return "🎲 Seeds"
-
-        if any(w in input_lower for w in ["steps", "cfg", "denoise"]):
-            return "⚡ Generation"
-
-        if any(w in class_lower for w in ["image", "resize", "scale", "upscale"]):
-            return "🖼️ Images"
-
-        if any(w in class_lower for w in ["video", "frame", "fps"]):
-            return "🎬 Video"
-
-        if "batch" in class_lower or "batch" in title_lower:
-            return f"📦 Batch"
-
-        if any(w in class_lower for w in ["audio", "sound", "tts"]):
-            return "🔊 Audio"
-
-        if any(w in class_lower for w in ["save", "output", "preview", "combine"]):
-            return "💾 Output"
-
-        return f"🔧 {title}"
+            return "📝 Prompts"
+        return category
 
     def generate_html(
         self, selected_indices, app_name, server_url, output_path, enable_features
@@ -670,239 +1066,108 @@ class SmartWorkflowGenerator:
         if not selected_indices:
             return "❌ Please select at least one parameter", None
 
-        selected = [
-            self.parameters[i] for i in selected_indices if i < len(self.parameters)
-        ]
-
-        # Group by category
-        grouped = {}
-        for param in selected:
-            cat = param["category"]
-            if cat not in grouped:
-                grouped[cat] = []
-            grouped[cat].append(param)
+        # Group the selected parameters by category in one pass
+        grouped = defaultdict(list)
+        n_params = len(self.parameters)
+        n_selected = 0
+        for i in selected_indices:
+            if i < n_params:
+                param = self.parameters[i]
+                grouped[param["category"]].append(param)
+                n_selected += 1
+        # Sections are laid out alphabetically; sort here, once
+        grouped = dict(sorted(grouped.items()))
 
         # Parse enabled features
+        enabled = frozenset(enable_features)
         features = {
-            "dark_mode": "Dark Mode" in enable_features,
-            "presets": "Preset System" in enable_features,
-            "gallery": "Enhanced Gallery" in enable_features,
-            "progress": "Progress Tracking" in enable_features,
-            "tooltips": "Tooltips" in enable_features,
-            "keyboard": "Keyboard Shortcuts" in enable_features,
-            "autosave": "Auto-save Parameters" in enable_features,
-            "batch": "Batch Generation" in enable_features,
-        }
-
-        html = self.build_enhanced_html(
-            app_name, server_url, output_path, grouped, self.workflow, features
-        )
+            "dark_mode": "Dark Mode" in enabled,
+            "presets": "Preset System" in enabled,
+            "gallery": "Enhanced Gallery" in enabled,
+            "progress": "Progress Tracking" in enabled,
+            "tooltips": "Tooltips" in enabled,
+            "keyboard": "Keyboard Shortcuts" in enabled,
+            "autosave": "Auto-save Parameters" in enabled,
+            "batch": "Batch Generation" in enabled,
+        }
 
-        filename = f"{app_name.replace(' ', '_').replace('/', '_')}.html"
+        filename = f"{_slugify(app_name)}.html"
         filepath = Path(filename)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        logger.info(f"✅ Generated: {filename} ({len(html)} bytes)")
-
-        result = f"✅ Generated: {filename}\n"
-        result += f"📊 Parameters: {len(selected)}\n"
-        result += f"📂 Categories: {len(grouped)}\n"
-        result += f"🎨 Features: {', '.join([k for k, v in features.items() if v])}\n"
-        result += f"📦 Size: {len(html) // 1024}KB\n"
-        result += f"📁 Location: {str(filepath.absolute())}"
-
-        return result, str(filepath.absolute())
-
-    def build_enhanced_html(
-        self, app_name, server_url, output_path, grouped, workflow, features
-    ):
-        """Build modern, feature-rich HTML"""
+        # Identical inputs give an identical page, so skip building and
+        # writing it again if the file we last wrote is still on disk
+        key = hashlib.blake2b(
+            _dumps(
+                [
+                    self.VERSION,
+                    app_name,
+                    server_url,
+                    output_path,
+                    features,
+                    grouped,
+                    self.workflow,
+                ]
+            ),
+            digest_size=16,
+        ).hexdigest()
 
-        # Generate parameter inputs HTML
-        inputs_html = ""
-        param_map = []
-        bypass_toggles = []
+        cached = self._html_cache.get(filename)
+        try:
+            mtime = filepath.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        # A deleted .gz/.br copy also means the page gets rewritten
+        copies_present = all(
+            os.path.exists(f"{filepath}{ext}")
+            for ext, enabled in ((".gz", _GZIP_COPY), (".br", _BROTLI_COPY))
+            if enabled
+        )
 
-        for category, params in sorted(grouped.items()):
-            cat_id = (
-                category.replace(" ", "_")
-                .replace(":", "_")
-                .replace("🤖", "")
-                .replace("📝", "")
-                .replace("⚙️", "")
-                .replace("🎨", "")
-                .replace("✨", "")
-                .replace("📂", "")
-                .replace("📐", "")
-                .replace("🎯", "")
-                .replace("🎲", "")
-                .replace("⚡", "")
-                .replace("🖼️", "")
-                .replace("🎬", "")
-                .replace("📦", "")
-                .replace("🔊", "")
-                .replace("💾", "")
-                .replace("🔧", "")
-                .strip()
+        if cached and cached[:2] == (key, mtime) and copies_present:
+            size = cached[2]
+            status = "♻️ Unchanged"
+            logger.info(f"{status}: {filename} ({size} bytes)")
+        else:
+            css_href = None
+            if _EXTERNAL_CSS:
+                css_href = self._STATIC_CSS_FILE
+                css_path = filepath.parent / css_href
+                # Shared by every page; content-addressed, so never rewritten
+                if not css_path.exists():
+                    _write_chunks(
+                        css_path, [self._STATIC_CSS], gzip_copy=_GZIP_COPY, brotli_copy=_BROTLI_COPY
+                    )
+            chunks = self.build_enhanced_html(
+                app_name,
+                server_url,
+                output_path,
+                grouped,
+                self.workflow,
+                features,
+                css_href=css_href,
             )
-            bypass_id = f"bypass_{cat_id}"
-
-            cat_nodes = set(p["node_id"] for p in params)
-            bypass_toggles.append({"id": bypass_id, "nodes": list(cat_nodes)})
-
-            inputs_html += f'''
-<div class="category-section" id="section_{cat_id}">
-    <div class="category-header" onclick="toggleCategory('{cat_id}')">
-        <h3>{category}</h3>
-        <div class="category-controls">
-            <label class="bypass-toggle" title="Bypass this entire category">
-                <input type="checkbox" id="{bypass_id}" onchange="handleBypass('{bypass_id}')">
-                <span>Bypass</span>
-            </label>
-            <span class="collapse-icon" id="collapse_{cat_id}">▼</span>
-        </div>
-    </div>
-    <div class="category-content" id="content_{cat_id}">
-'''
-
-            for param in params:
-                param_id = f"param_{param['node_id']}_{param['input_name']}"
-                param_map.append(
-                    {
-                        "id": param_id,
-                        "node_id": param["node_id"],
-                        "input_name": param["input_name"],
-                        "type": param["type"],
-                        "has_upload": param.get("has_upload", False),
-                        "upload_type": param.get("upload_type", None),
-                    }
-                )
-
-                tooltip_html = ""
-                if features["tooltips"] and param["description"]:
-                    tooltip_html = f'<span class="info-icon" title="{param["description"]}">ℹ️</span>'
-
-                label_html = f'<label for="{param_id}">{param["node_title"]} → {param["input_name"]}{tooltip_html}</label>'
-
-                input_html = self.generate_input_html(param, param_id)
-
-                inputs_html += f"""
-        <div class="form-group">
-            {label_html}
-            {input_html}
-        </div>
-"""
+            size = _write_chunks(filepath, chunks, gzip_copy=_GZIP_COPY, brotli_copy=_BROTLI_COPY)
+            self._html_cache[filename] = (key, filepath.stat().st_mtime_ns, size)
+            status = "✅ Generated"
+            logger.info(f"{status}: {filename} ({size} bytes)")
 
-            inputs_html += """
-    </div>
-</div>
-"""
-
-        # Build feature sections conditionally
-        preset_section = ""
-        if features["presets"]:
-            preset_section = """
-                    <div class="preset-section mb-3">
-                        <label><i class="fas fa-save me-2"></i>Presets</label>
-                        <div class="preset-controls">
-                            <select id="presetSelect" onchange="loadPreset()">
-                                <option value="">Select preset...</option>
-                            </select>
-                            <button onclick="savePreset()" title="Save current settings"><i class="fas fa-plus"></i></button>
-                            <button onclick="deletePreset()" title="Delete selected preset"><i class="fas fa-trash"></i></button>
-                        </div>
-                    </div>
-"""
-
-        batch_section = ""
-        if features["batch"]:
-            batch_section = """
-                    <div class="batch-section mb-3">
-                        <label class="d-flex align-items-center">
-                            <input type="checkbox" id="batchMode" onchange="toggleBatchMode()" class="me-2">
-                            <i class="fas fa-layer-group me-2"></i>Batch Mode
-                        </label>
-                        <div class="batch-controls" id="batchControls">
-                            <label>Number of generations:</label>
-                            <input type="number" id="batchCount" value="3" min="1" max="20" class="form-control">
-                            <label class="mt-2">
-                                <input type="checkbox" id="batchRandomSeed" checked class="me-2">
-                                Randomize seed each time
-                            </label>
-                        </div>
-                    </div>
-"""
-
-        progress_section = ""
-        if features["progress"]:
-            progress_section = """
-                    <div class="progress-container" id="progressContainer">
-                        <div class="progress-bar-custom">
-                            <div class="progress-bar-fill" id="progressBar">0%</div>
-                        </div>
-                        <p class="text-center mt-2 mb-0" id="progressText">Initializing...</p>
-                    </div>
-"""
-
-        theme_toggle = ""
-        if features["dark_mode"]:
-            theme_toggle = '<button class="theme-toggle" onclick="toggleTheme()"><i class="fas fa-moon"></i> <span id="theme-text">Dark</span></button>'
-
-        shortcuts_toggle = ""
-        if features["keyboard"]:
-            shortcuts_toggle = '<button class="theme-toggle" onclick="toggleShortcutsHelp()"><i class="fas fa-keyboard"></i> Shortcuts</button>'
-
-        gallery_section = ""
-        if features["gallery"]:
-            gallery_section = """
-                <div class="gallery">
-                    <div class="d-flex justify-content-between align-items-center mb-3">
-                        <h3 class="mb-0"><i class="fas fa-images me-2"></i>Gallery</h3>
-                        <div>
-                            <button onclick="clearGallery()" class="btn-sm btn-outline-danger" title="Clear gallery">
-                                <i class="fas fa-trash"></i>
-                            </button>
-                        </div>
-                    </div>
-                    <div class="gallery-grid" id="galleryGrid">
-                        <div class="text-center text-muted">No images yet. Click Generate!</div>
-                    </div>
-                </div>
-"""
-
-        shortcuts_help = ""
-        if features["keyboard"]:
-            shortcuts_help = """
-    <div class="shortcuts-help" id="shortcutsHelp">
-        <h4>Keyboard Shortcuts</h4>
-        <p><kbd>Ctrl</kbd> + <kbd>Enter</kbd> - Generate</p>
-        <p><kbd>Ctrl</kbd> + <kbd>R</kbd> - Reset</p>
-        <p><kbd>Ctrl</kbd> + <kbd>S</kbd> - Save Preset</p>
-        <p><kbd>?</kbd> - Toggle this help</p>
-    </div>
-"""
-
-        # Generate complete HTML
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="{app_name} - Professional ComfyUI Interface">
-    <meta name="generator" content="ComfyUI HTML Generator v{self.VERSION}">
-    <title>{app_name}</title>
-    
-    <!-- Bootstrap 5 CSS -->
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <!-- Font Awesome -->
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-    <!-- GLightbox for image viewer -->
-    <link href="https://cdn.jsdelivr.net/npm/glightbox@3.2.0/dist/css/glightbox.min.css" rel="stylesheet">
-    
-    <style>
-        :root {{
+        result = f"{status}: {filename}\n"
+        result += f"📊 Parameters: {n_selected}\n"
+        result += f"📂 Categories: {len(grouped)}\n"
+        result += f"🎨 Features: {', '.join([k for k, v in features.items() if v])}\n"
+        result += f"📦 Size: {size // 1024}KB\n"
+        abs_path = str(filepath.absolute())
+        result += f"📁 Location: {abs_path}"
+
+        return result, abs_path
+
+    # Page stylesheet. Nothing in it is dynamic, so it is kept out of the
+    # f-string template, minified and encoded once at import rather than
+    # per page.
+    _STATIC_CSS = _minify_css(
+        """\
+        :root {
             --primary: #6366f1;
             --primary-dark: #4f46e5;
             --secondary: #8b5cf6;
@@ -915,9 +1180,9 @@ class SmartWorkflowGenerator:
             --border: #e5e7eb;
             --shadow: rgba(0, 0, 0, 0.1);
             --shadow-lg: rgba(0, 0, 0, 0.2);
-        }}
+        }
         
-        [data-theme="dark"] {{
+        [data-theme="dark"] {
             --primary: #818cf8;
             --primary-dark: #6366f1;
             --secondary: #a78bfa;
@@ -930,28 +1195,28 @@ class SmartWorkflowGenerator:
             --border: #374151;
             --shadow: rgba(255, 255, 255, 0.1);
             --shadow-lg: rgba(255, 255, 255, 0.2);
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
             background: var(--light);
             color: var(--dark);
             transition: background 0.3s, color 0.3s;
-        }}
+        }
         
-        [data-theme="dark"] body {{
+        [data-theme="dark"] body {
             background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
             color: var(--dark);
-        }}
+        }
         
         /* Header */
-        .app-header {{
+        .app-header {
             background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
             color: white;
             padding: 1.5rem 0;
@@ -959,22 +1224,22 @@ class SmartWorkflowGenerator:
             position: sticky;
             top: 0;
             z-index: 1000;
-        }}
+        }
         
-        .app-header h1 {{
+        .app-header h1 {
             font-size: 2rem;
             font-weight: 700;
             margin: 0;
-        }}
+        }
         
-        .header-controls {{
+        .header-controls {
             display: flex;
             gap: 1rem;
             align-items: center;
-        }}
+        }
         
         /* Theme toggle */
-        .theme-toggle {{
+        .theme-toggle {
             background: rgba(255, 255, 255, 0.2);
             border: none;
             padding: 0.5rem 1rem;
@@ -985,54 +1250,54 @@ class SmartWorkflowGenerator:
             display: flex;
             align-items: center;
             gap: 0.5rem;
-        }}
+        }
         
-        .theme-toggle:hover {{
+        .theme-toggle:hover {
             background: rgba(255, 255, 255, 0.3);
             transform: scale(1.05);
-        }}
+        }
         
         /* Container */
-        .main-container {{
+        .main-container {
             max-width: 1400px;
             margin: 1.5rem auto;
             padding: 0 1.5rem;
-        }}
+        }
         
-        .content-grid {{
+        .content-grid {
             display: grid;
             grid-template-columns: 1fr 380px;
             gap: 1.5rem;
-        }}
+        }
         
-        @media (max-width: 1024px) {{
-            .content-grid {{
+        @media (max-width: 1024px) {
+            .content-grid {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
         
         /* Category sections */
-        .category-section {{
+        .category-section {
             background: white;
             border-radius: 12px;
             box-shadow: 0 2px 8px var(--shadow);
             margin-bottom: 1rem;
             overflow: hidden;
             transition: all 0.3s;
-        }}
+        }
         
-        [data-theme="dark"] .category-section {{
+        [data-theme="dark"] .category-section {
             background: rgba(255, 255, 255, 0.05);
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
+        }
         
-        .category-section:hover {{
+        .category-section:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px var(--shadow-lg);
-        }}
+        }
         
-        .category-header {{
+        .category-header {
             background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
             color: white;
             padding: 1rem 1.5rem;
@@ -1041,70 +1306,70 @@ class SmartWorkflowGenerator:
             justify-content: space-between;
             align-items: center;
             user-select: none;
-        }}
+        }
         
-        .category-header h3 {{
+        .category-header h3 {
             font-size: 1.25rem;
             font-weight: 600;
             margin: 0;
-        }}
+        }
         
-        .category-controls {{
+        .category-controls {
             display: flex;
             gap: 1rem;
             align-items: center;
-        }}
+        }
         
-        .bypass-toggle {{
+        .bypass-toggle {
             display: flex;
             align-items: center;
             gap: 0.5rem;
             font-size: 0.9rem;
             cursor: pointer;
-        }}
+        }
         
-        .bypass-toggle input {{
+        .bypass-toggle input {
             cursor: pointer;
-        }}
+        }
         
-        .collapse-icon {{
+        .collapse-icon {
             transition: transform 0.3s;
             font-size: 1.2rem;
-        }}
+        }
         
-        .collapsed .collapse-icon {{
+        .collapsed .collapse-icon {
             transform: rotate(-90deg);
-        }}
+        }
         
-        .category-content {{
+        .category-content {
             padding: 1.25rem;
             max-height: 2000px;
             overflow: hidden;
             transition: max-height 0.3s ease-out, padding 0.3s;
-        }}
+        }
         
-        .category-content.collapsed {{
+        .category-content.collapsed {
             max-height: 0;
             padding: 0 1.25rem;
-        }}
+        }
         
         /* Form elements */
-        .form-group {{
+        .form-group {
             margin-bottom: 1rem;
-        }}
+        }
         
-        .form-group label {{
+        .form-group label {
             display: block;
             font-weight: 500;
             margin-bottom: 0.375rem;
             color: var(--dark);
             font-size: 0.9375rem;
-        }}
+        }
         
         .form-group input[type="text"],
         .form-group input[type="number"],
         .form-group select,
-        .form-group textarea {{
+        .form-group textarea {
             width: 100%;
             padding: 0.625rem 0.75rem;
             border: 2px solid var(--border);
@@ -1113,40 +1378,41 @@ class SmartWorkflowGenerator:
             transition: all 0.3s;
             background: var(--light);
             color: var(--dark);
-        }}
+        }
         
         .form-group input:focus,
         .form-group select:focus,
-        .form-group textarea:focus {{
+        .form-group textarea:focus {
             outline: none;
             border-color: var(--primary);
             box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.1);
-        }}
+        }
         
-        .form-group textarea {{
+        .form-group textarea {
             min-height: 100px;
             resize: vertical;
             font-family: 'Monaco', 'Consolas', monospace;
-        }}
+        }
         
         /* Range sliders */
-        input[type="range"] {{
+        input[type="range"] {
             min-height: 100px;
             resize: vertical;
             font-family: 'Monaco', 'Consolas', monospace;
-        }}
+        }
         
         /* Range sliders */
-        input[type="range"] {{
+        input[type="range"] {
             width: 100%;
             height: 6px;
             border-radius: 3px;
-            background: linear-gradient(to right, var(--primary) 0%, var(--primary) 50%, var(--border) 50%, var(--border) 100%);
+            /* --fill is set per slider by setSliderFill() */
+            background: linear-gradient(to right, var(--primary) 0%, var(--primary) var(--fill, 50%), var(--border) var(--fill, 50%), var(--border) 100%);
             outline: none;
             transition: background 0.3s;
-        }}
+        }
         
-        input[type="range"]::-webkit-slider-thumb {{
+        input[type="range"]::-webkit-slider-thumb {
             -webkit-appearance: none;
             appearance: none;
             width: 20px;
@@ -1156,14 +1422,14 @@ class SmartWorkflowGenerator:
             cursor: pointer;
             box-shadow: 0 2px 4px var(--shadow);
             transition: all 0.3s;
-        }}
+        }
         
-        input[type="range"]::-webkit-slider-thumb:hover {{
+        input[type="range"]::-webkit-slider-thumb:hover {
             background: var(--primary-dark);
             transform: scale(1.2);
-        }}
+        }
         
-        .slider-value {{
+        .slider-value {
             display: inline-block;
             min-width: 60px;
             padding: 0.25rem 0.75rem;
@@ -1174,23 +1440,23 @@ class SmartWorkflowGenerator:
             font-weight: 600;
             text-align: center;
             margin-left: 0.5rem;
-        }}
+        }
         
         /* Toggle switches */
-        .toggle-switch {{
+        .toggle-switch {
             position: relative;
             display: inline-block;
             width: 60px;
             height: 30px;
-        }}
+        }
         
-        .toggle-switch input {{
+        .toggle-switch input {
             opacity: 0;
             width: 0;
             height: 0;
-        }}
+        }
         
-        .slider-toggle {{
+        .slider-toggle {
             position: absolute;
             cursor: pointer;
             top: 0;
@@ -1200,9 +1466,9 @@ class SmartWorkflowGenerator:
             background-color: #ccc;
             transition: 0.4s;
             border-radius: 30px;
-        }}
+        }
         
-        .slider-toggle:before {{
+        .slider-toggle:before {
             position: absolute;
             content: "";
             height: 22px;
@@ -1212,18 +1478,18 @@ class SmartWorkflowGenerator:
             background-color: white;
             transition: 0.4s;
             border-radius: 50%;
-        }}
+        }
         
-        input:checked + .slider-toggle {{
+        input:checked + .slider-toggle {
             background-color: var(--primary);
-        }}
+        }
         
-        input:checked + .slider-toggle:before {{
+        input:checked + .slider-toggle:before {
             transform: translateX(30px);
-        }}
+        }
         
         /* Buttons */
-        .btn-primary {{
+        .btn-primary {
             background: linear-gradient(135deg, var(--primary) 0%, var(--secondary) 100%);
             color: white;
             border: none;
@@ -1235,24 +1501,24 @@ class SmartWorkflowGenerator:
             transition: all 0.3s;
             box-shadow: 0 4px 6px var(--shadow);
             width: 100%;
-        }}
+        }
         
-        .btn-primary:hover {{
+        .btn-primary:hover {
             transform: translateY(-2px);
             box-shadow: 0 6px 12px var(--shadow-lg);
-        }}
+        }
         
-        .btn-primary:active {{
+        .btn-primary:active {
             transform: translateY(0);
-        }}
+        }
         
-        .btn-primary:disabled {{
+        .btn-primary:disabled {
             opacity: 0.6;
             cursor: not-allowed;
             transform: none;
-        }}
+        }
         
-        .btn-secondary {{
+        .btn-secondary {
             background: white;
             color: var(--primary);
             border: 2px solid var(--primary);
@@ -1263,56 +1529,56 @@ class SmartWorkflowGenerator:
             transition: all 0.3s;
             width: 100%;
             margin-top: 0.5rem;
-        }}
+        }
         
-        .btn-secondary:hover {{
+        .btn-secondary:hover {
             background: var(--primary);
             color: white;
-        }}
+        }
         
         /* Sidebar */
-        .sidebar {{
+        .sidebar {
             position: sticky;
             top: 100px;
             height: fit-content;
-        }}
+        }
         
-        .control-panel {{
+        .control-panel {
             background: white;
             border-radius: 12px;
             padding: 1.5rem;
             box-shadow: 0 2px 8px var(--shadow);
             margin-bottom: 1.5rem;
-        }}
+        }
         
-        [data-theme="dark"] .control-panel {{
+        [data-theme="dark"] .control-panel {
             background: rgba(255, 255, 255, 0.05);
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
+        }
         
         /* Gallery */
-        .gallery {{
+        .gallery {
             background: white;
             border-radius: 12px;
             padding: 1.25rem;
             box-shadow: 0 2px 8px var(--shadow);
-        }}
+        }
         
-        [data-theme="dark"] .gallery {{
+        [data-theme="dark"] .gallery {
             background: rgba(255, 255, 255, 0.05);
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
+        }
         
-        .gallery-grid {{
+        .gallery-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(120px, 1fr));
             gap: 0.75rem;
             margin-top: 1rem;
-        }}
+        }
         
-        .gallery-item {{
+        .gallery-item {
             position: relative;
             aspect-ratio: 1;
             border-radius: 8px;
@@ -1320,29 +1586,29 @@ class SmartWorkflowGenerator:
             cursor: pointer;
             transition: all 0.3s;
             box-shadow: 0 2px 4px var(--shadow);
-        }}
+        }
         
-        .gallery-item:hover {{
+        .gallery-item:hover {
             transform: scale(1.05);
             box-shadow: 0 4px 8px var(--shadow-lg);
-        }}
+        }
         
         .gallery-item img,
-        .gallery-item video {{
+        .gallery-item video {
             width: 100%;
             height: 100%;
             object-fit: cover;
-        }}
+        }
 
-        .gallery-item video.video-thumb.loading {{
+        .gallery-item video.video-thumb.loading {
             opacity: 0;
-        }}
+        }
 
-        .gallery-item video.video-thumb {{
+        .gallery-item video.video-thumb {
             background: #1a1a2e;
-        }}
+        }
 
-        .gallery-item .video-overlay {{
+        .gallery-item .video-overlay {
             position: absolute;
             inset: 0;
             display: flex;
@@ -1354,12 +1620,12 @@ class SmartWorkflowGenerator:
             pointer-events: none;
             opacity: 0.85;
             transition: opacity 0.2s;
-        }}
+        }
 
-        .gallery-item:hover .video-overlay {{
+        .gallery-item:hover .video-overlay {
             opacity: 0.0;
-        }}
-        .gallery-item-info {{
+        }
+        .gallery-item-info {
             position: absolute;
             bottom: 0;
             left: 0;
@@ -1370,32 +1636,32 @@ class SmartWorkflowGenerator:
             font-size: 0.8rem;
             transform: translateY(100%);
             transition: transform 0.3s;
-        }}
+        }
         
-        .gallery-item:hover .gallery-item-info {{
+        .gallery-item:hover .gallery-item-info {
             transform: translateY(0);
-        }}
+        }
         
         /* Progress bar */
-        .progress-container {{
+        .progress-container {
             margin: 1rem 0;
             display: none;
-        }}
+        }
         
-        .progress-container.active {{
+        .progress-container.active {
             display: block;
-        }}
+        }
         
-        .progress-bar-custom {{
+        .progress-bar-custom {
             width: 100%;
             height: 30px;
             background: var(--border);
             border-radius: 15px;
             overflow: hidden;
             position: relative;
-        }}
+        }
         
-        .progress-bar-fill {{
+        .progress-bar-fill {
             height: 100%;
             background: linear-gradient(90deg, var(--primary), var(--secondary));
             transition: width 0.3s;
@@ -1405,25 +1671,25 @@ class SmartWorkflowGenerator:
             color: white;
             font-weight: 600;
             font-size: 0.9rem;
-        }}
+        }
         
         /* Presets */
-        .preset-controls {{
+        .preset-controls {
             display: flex;
             gap: 0.5rem;
             margin-top: 1rem;
-        }}
+        }
         
-        .preset-controls select {{
+        .preset-controls select {
             flex: 1;
             padding: 0.5rem;
             border: 2px solid var(--border);
             border-radius: 8px;
             background: var(--light);
             color: var(--dark);
-        }}
+        }
         
-        .preset-controls button {{
+        .preset-controls button {
             padding: 0.5rem 1rem;
             border: 2px solid var(--primary);
             border-radius: 8px;
@@ -1431,15 +1697,15 @@ class SmartWorkflowGenerator:
             color: var(--primary);
             cursor: pointer;
             transition: all 0.3s;
-        }}
+        }
         
-        .preset-controls button:hover {{
+        .preset-controls button:hover {
             background: var(--primary);
             color: white;
-        }}
+        }
         
         /* Info icon */
-        .info-icon {{
+        .info-icon {
             display: inline-block;
             width: 18px;
             height: 18px;
@@ -1451,53 +1717,69 @@ class SmartWorkflowGenerator:
             font-size: 12px;
             cursor: help;
             margin-left: 0.5rem;
-        }}
+        }
         
-        /* Status messages */
-        .status-message {{
+        /* Status messages: a toast over the page, so showing and hiding it
+           is an opacity/transform change on its own layer, not a relayout */
+        .status-message {
+            position: fixed;
+            top: 1rem;
+            right: 1rem;
+            z-index: 1050;
+            max-width: min(420px, calc(100vw - 2rem));
             padding: 1rem;
             border-radius: 8px;
-            margin: 1rem 0;
-            display: none;
-        }}
+            background-color: var(--light);
+            box-shadow: 0 4px 12px var(--shadow-lg);
+            opacity: 0;
+            transform: translateY(-0.5rem);
+            visibility: hidden;
+            pointer-events: none;
+            transition: opacity 0.2s, transform 0.2s, visibility 0s 0.2s;
+            will-change: opacity, transform;
+        }
         
-        .status-message.show {{
-            display: block;
-        }}
+        .status-message.show {
+            opacity: 1;
+            transform: none;
+            visibility: visible;
+            pointer-events: auto;
+            transition: opacity 0.2s, transform 0.2s;
+        }
         
-        .status-message.success {{
-            background: rgba(16, 185, 129, 0.1);
+        .status-message.success {
+            background-image: linear-gradient(rgba(16, 185, 129, 0.1), rgba(16, 185, 129, 0.1));
             border: 2px solid var(--success);
             color: var(--success);
-        }}
+        }
         
-        .status-message.error {{
-            background: rgba(239, 68, 68, 0.1);
+        .status-message.error {
+            background-image: linear-gradient(rgba(239, 68, 68, 0.1), rgba(239, 68, 68, 0.1));
             border: 2px solid var(--danger);
             color: var(--danger);
-        }}
+        }
         
-        .status-message.warning {{
-            background: rgba(245, 158, 11, 0.1);
+        .status-message.warning {
+            background-image: linear-gradient(rgba(245, 158, 11, 0.1), rgba(245, 158, 11, 0.1));
             border: 2px solid var(--warning);
             color: var(--warning);
-        }}
+        }
         
         /* Batch mode */
-        .batch-controls {{
+        .batch-controls {
             display: none;
             margin-top: 1rem;
             padding: 1rem;
             border: 2px dashed var(--border);
             border-radius: 8px;
-        }}
+        }
         
-        .batch-controls.active {{
+        .batch-controls.active {
             display: block;
-        }}
+        }
         
         /* Keyboard shortcuts help */
-        .shortcuts-help {{
+        .shortcuts-help {
             position: fixed;
             bottom: 20px;
             right: 20px;
@@ -1508,26 +1790,26 @@ class SmartWorkflowGenerator:
             font-size: 0.85rem;
             display: none;
             z-index: 2000;
-        }}
+        }
         
-        .shortcuts-help.show {{
+        .shortcuts-help.show {
             display: block;
-        }}
+        }
         
-        .shortcuts-help h4 {{
+        .shortcuts-help h4 {
             margin: 0 0 0.5rem 0;
             font-size: 1rem;
-        }}
+        }
         
-        .shortcuts-help kbd {{
+        .shortcuts-help kbd {
             background: #555;
             padding: 0.2rem 0.4rem;
             border-radius: 4px;
             font-family: monospace;
-        }}
+        }
         
         /* Loading spinner */
-        .spinner {{
+        .spinner {
             border: 3px solid var(--border);
             border-top: 3px solid var(--primary);
             border-radius: 50%;
@@ -1536,95 +1818,95 @@ class SmartWorkflowGenerator:
             animation: spin 1s linear infinite;
             margin: 20px auto;
             display: none;
-        }}
+        }
         
-        .spinner.active {{
+        .spinner.active {
             display: block;
-        }}
+        }
         
-        @keyframes spin {{
-            0% {{ transform: rotate(0deg); }}
-            100% {{ transform: rotate(360deg); }}
-        }}
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
         
         /* Responsive */
-        @media (max-width: 768px) {{
-            .app-header h1 {{
+        @media (max-width: 768px) {
+            .app-header h1 {
                 font-size: 1.5rem;
-            }}
+            }
             
-            .content-grid {{
+            .content-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .sidebar {{
+            .sidebar {
                 position: static;
-            }}
+            }
             
-            .gallery-grid {{
+            .gallery-grid {
                 grid-template-columns: repeat(auto-fill, minmax(100px, 1fr));
-            }}
-        }}
+            }
+        }
         
         /* Animations */
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(20px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
         
-        .fade-in {{
+        .fade-in {
             animation: fadeIn 0.5s ease-out;
-        }}
+        }
         
-        .input-group {{
+        .input-group {
             display: flex;
             gap: 0.5rem;
-        }}
+        }
         
-        .input-group input {{
+        .input-group input {
             flex: 1;
-        }}
+        }
         
-        .btn-sm {{
+        .btn-sm {
             padding: 0.25rem 0.5rem;
             font-size: 0.875rem;
-        }}
+        }
         
-        .btn-outline-danger {{
+        .btn-outline-danger {
             border: 1px solid var(--danger);
             background: transparent;
             color: var(--danger);
             border-radius: 4px;
             cursor: pointer;
-        }}
+        }
         
-        .btn-outline-danger:hover {{
+        .btn-outline-danger:hover {
             background: var(--danger);
             color: white;
-        }}
+        }
         
-        .slider-container {{
+        .slider-container {
             display: flex;
             align-items: center;
             gap: 0.5rem;
-        }}
+        }
         
-        .slider-container input[type="range"] {{
+        .slider-container input[type="range"] {
             flex: 1;
-        }}
+        }
         
         /* Image Upload Widget */
-        .image-upload-widget {{
+        .image-upload-widget {
             width: 100%;
-        }}
+        }
         
-        .image-upload-widget .input-group {{
+        .image-upload-widget .input-group {
             display: flex;
             gap: 0.5rem;
             align-items: stretch;
-        }}
+        }
         
-        .image-upload-widget .btn-outline-primary {{
+        .image-upload-widget .btn-outline-primary {
             background: transparent;
             border: 2px dashed var(--primary);
             color: var(--primary);
@@ -1636,39 +1918,39 @@ class SmartWorkflowGenerator:
             display: flex;
             align-items: center;
             gap: 0.5rem;
-        }}
+        }
         
-        .image-upload-widget .btn-outline-primary:hover {{
+        .image-upload-widget .btn-outline-primary:hover {
             background: var(--primary);
             color: white;
             border-style: solid;
-        }}
+        }
         
-        .image-upload-widget select.form-control {{
+        .image-upload-widget select.form-control {
             flex: 1;
             min-width: 150px;
-        }}
+        }
         
-        .image-preview-container {{
+        .image-preview-container {
             background: var(--light);
             border: 1px solid var(--border);
             border-radius: 8px;
             padding: 1rem;
             text-align: center;
-        }}
+        }
         
-        [data-theme="dark"] .image-preview-container {{
+        [data-theme="dark"] .image-preview-container {
             background: rgba(255, 255, 255, 0.05);
-        }}
+        }
         
-        .image-preview-container img, .image-preview-container audio {{
+        .image-preview-container img, .image-preview-container audio {
             max-width: 100%;
             height: auto;
             border-radius: 8px;
             box-shadow: 0 2px 8px var(--shadow);
-        }}
+        }
         
-        .image-preview-container .btn-outline-danger {{
+        .image-preview-container .btn-outline-danger {
             background: transparent;
             border: 1px solid var(--danger);
             color: var(--danger);
@@ -1677,112 +1959,57 @@ class SmartWorkflowGenerator:
             cursor: pointer;
             transition: all 0.3s;
             margin-top: 0.5rem;
-        }}
+        }
         
-        .image-preview-container .btn-outline-danger:hover {{
+        .image-preview-container .btn-outline-danger:hover {
             background: var(--danger);
             color: white;
-        }}
-    </style>
-</head>
-<body>
-    <!-- Header -->
-    <header class="app-header">
-        <div class="container-fluid">
-            <div class="d-flex justify-content-between align-items-center">
-                <h1><i class="fas fa-magic me-2"></i>{app_name}</h1>
-                <div class="header-controls">
-                    {theme_toggle}
-                    {shortcuts_toggle}
-                </div>
-            </div>
-        </div>
-    </header>
-    
-    <!-- Main Content -->
-    <div class="main-container">
-        <div class="status-message" id="statusMessage"></div>
-        
-        <div class="content-grid">
-            <!-- Left: Parameters -->
-            <div class="parameters-section">
-                {inputs_html}
-            </div>
-            
-            <!-- Right: Controls & Gallery -->
-            <div class="sidebar">
-                <!-- Control Panel -->
-                <div class="control-panel">
-                    <h3 class="mb-3"><i class="fas fa-sliders-h me-2"></i>Controls</h3>
-                    
-                    {preset_section}
-                    
-                    {batch_section}
-                    
-                    <button class="btn-primary" onclick="generate()" id="generateBtn">
-                        <i class="fas fa-play me-2"></i>Generate
-                    </button>
-                    
-                    <button class="btn-secondary" onclick="resetParameters()">
-                        <i class="fas fa-undo me-2"></i>Reset All
-                    </button>
-                    
-                    {progress_section}
-                    
-                    <div class="spinner" id="loadingSpinner"></div>
-                </div>
-                
-                <!-- Gallery -->
-                {gallery_section}
-            </div>
-        </div>
-    </div>
-    
-    <!-- Keyboard Shortcuts Help -->
-    {shortcuts_help}
-    
-    <!-- Bootstrap JS -->
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-    <!-- GLightbox JS -->
-    <script src="https://cdn.jsdelivr.net/npm/glightbox@3.2.0/dist/js/glightbox.min.js"></script>
-    
-    <script>
-        // Configuration
-        const CONFIG = {{
-            serverUrl: {json.dumps(server_url)},
-            outputPath: {json.dumps(output_path)},
-            features: {json.dumps(features)},
-            pollInterval: 1000
-        }};
-        
-        // Workflow template
-        const workflowTemplate = {json.dumps(workflow, indent=4)};
-        
-        // Parameter mapping
-        const paramMap = {json.dumps(param_map, indent=4)};
-        
-        // Bypass toggles
-        const bypassToggles = {json.dumps(bypass_toggles, indent=4)};
-        
+        }
+"""
+    ).encode("utf-8")
+    # Name of the stylesheet file with _EXTERNAL_CSS. It changes whenever
+    # the CSS does, so a cached copy is never stale.
+    _STATIC_CSS_FILE = (
+        f"webui-generator-{hashlib.blake2b(_STATIC_CSS, digest_size=6).hexdigest()}.css"
+    )
+
+    # Page script after the per-page data (CONFIG, paramMap, bypassToggles);
+    # like _STATIC_CSS it is the same for every
+    # page, so it is stored pre-encoded.
+    _STATIC_JS = """\
+        // Per-item/per-parameter tracing; a no-op unless COMFY_WEBUI_GEN_DEBUG
+        // was set when the page was generated
+        const dlog = CONFIG.debug ? console.log.bind(console) : () => {};
+
         // State
         let currentPromptId = null;
         let pollTimer = null;
-        let galleryItems = [];
+        let watchingPrompt = false; // submitted prompt hasn't finished yet
+
+        // The "No images yet" placeholder; detached while the gallery has
+        // items and put back by clearGallery
+        const galleryEmpty = document.getElementById('galleryEmpty');
+        const galleryFilenames = new Set(); // filenames of the cards in the grid
 
         // Client/session identifiers (for WebSocket progress routing)
         const clientId = (window.crypto && window.crypto.randomUUID) ? window.crypto.randomUUID() : ('client_' + Math.random().toString(16).slice(2));
         let ws = null;
+        let wsUrl = null; // derived from CONFIG.serverUrl on first connect
         let wsConnected = false;
+        let wsBackoff = 500; // next reconnect delay in ms, doubled per failure
         let lastProgressTs = 0;
+        let pendingProgress = null; // latest sampler step not yet painted
 
         
         // Initialize
-        document.addEventListener('DOMContentLoaded', function() {{
-            console.log('🚀 {app_name} v{self.VERSION} initialized');
+        document.addEventListener('DOMContentLoaded', function() {
+            console.log('🚀 ' + CONFIG.appName + ' v' + CONFIG.version + ' initialized');
             
             // Load saved theme
             if (CONFIG.features.dark_mode) loadTheme();
             
+            setupParamListeners();
+            
             // Load autosaved parameters
             if (CONFIG.features.autosave) loadAutosave();
             
@@ -1796,203 +2023,300 @@ class SmartWorkflowGenerator:
             updateAllSliders();
             
             // Setup GLightbox + gallery preload
-            if (CONFIG.features.gallery) {{
+            if (CONFIG.features.gallery) {
                 setupLightbox();
+                setupGalleryHover();
                 loadExistingFiles(); // auto-load existing outputs on page load
-            }}
+            }
 
             // Connect WebSocket for real-time progress updates
-            if (CONFIG.features.progress) {{
+            if (CONFIG.features.progress) {
                 connectWebSocket();
-            }}
+            }
 
             // Initialize any existing video thumbnails (if any)
             initAllVideoThumbnails();
-        }});
+        });
 
         // --- Progress UI helpers ---
-        function updateProgressUI(percent, text) {{
+        function updateProgressUI(percent, text) {
+            pendingProgress = null; // superseded by this update
             const progressBar = document.getElementById('progressBar');
             const progressText = document.getElementById('progressText');
-            if (progressBar) {{
+            if (progressBar) {
                 const p = Math.max(0, Math.min(100, Math.round(percent)));
                 progressBar.style.width = p + '%';
                 progressBar.textContent = p + '%';
-            }}
-            if (progressText && typeof text === 'string') {{
+            }
+            if (progressText && typeof text === 'string') {
                 progressText.textContent = text;
-            }}
+            }
             lastProgressTs = Date.now();
-        }}
+        }
+
+        // Sampler steps can arrive faster than the screen refreshes; keep
+        // only the latest one and paint it on the next frame
+        function scheduleProgressUI(percent, text) {
+            if (!pendingProgress) {
+                requestAnimationFrame(() => {
+                    const p = pendingProgress;
+                    if (p) updateProgressUI(p.percent, p.text);
+                });
+            }
+            pendingProgress = { percent, text };
+            lastProgressTs = Date.now();
+        }
 
-        function makeWsUrl(httpUrl) {{
-            try {{
+        function makeWsUrl(httpUrl) {
+            try {
                 const u = new URL(httpUrl);
                 const proto = (u.protocol === 'https:') ? 'wss:' : 'ws:';
-                return `${{proto}}//${{u.host}}/ws?clientId=${{encodeURIComponent(clientId)}}`;
-            }} catch (e) {{
+                return `${proto}//${u.host}/ws?clientId=${encodeURIComponent(clientId)}`;
+            } catch (e) {
                 // Fallback: naive replace
                 const proto = httpUrl.startsWith('https') ? 'wss' : 'ws';
-                return httpUrl.replace(/^https?/, proto) + `/ws?clientId=${{encodeURIComponent(clientId)}}`;
-            }}
-        }}
+                return httpUrl.replace(/^https?/, proto) + `/ws?clientId=${encodeURIComponent(clientId)}`;
+            }
+        }
 
         // --- WebSocket progress (ComfyUI /ws) ---
-        function connectWebSocket() {{
+        function reconnectWebSocket() {
+            // A background tab waits until it is looked at again
+            if (document.hidden) {
+                document.addEventListener('visibilitychange', reconnectWebSocket, { once: true });
+                return;
+            }
+            connectWebSocket();
+        }
+
+        function connectWebSocket() {
             if (ws && (ws.readyState === WebSocket.OPEN || ws.readyState === WebSocket.CONNECTING)) return;
 
-            const wsUrl = makeWsUrl(CONFIG.serverUrl);
+            if (!wsUrl) wsUrl = makeWsUrl(CONFIG.serverUrl);
             console.log('🔌 Connecting WebSocket:', wsUrl);
 
-            try {{
+            try {
                 ws = new WebSocket(wsUrl);
-            }} catch (e) {{
+            } catch (e) {
                 console.warn('WebSocket init failed:', e);
                 wsConnected = false;
                 return;
-            }}
+            }
+
+            // Binary frames are live previews we don't show; skip Blob wrapping
+            ws.binaryType = 'arraybuffer';
 
-            ws.onopen = () => {{
+            ws.onopen = () => {
                 wsConnected = true;
+                wsBackoff = 500;
                 console.log('✅ WebSocket connected');
-            }};
-
-            ws.onclose = () => {{
+                // Completion is reported over the socket now; one last look
+                // catches a prompt that finished while we were polling, then
+                // only the slow safety poll keeps running
+                if (pollTimer) {
+                    clearTimeout(pollTimer);
+                    pollTimer = null;
+                    checkPromptStatus();
+                    schedulePolling(CONFIG.pollMaxInterval);
+                }
+            };
+
+            ws.onclose = () => {
                 wsConnected = false;
-                console.warn('⚠️ WebSocket closed. Reconnecting soon...');
-                setTimeout(connectWebSocket, 1500);
-            }};
-
-            ws.onerror = (err) => {{
+                // Back off while ComfyUI is down instead of retrying every
+                // second and a half forever; jitter spreads out open tabs
+                const delay = wsBackoff + Math.random() * 250;
+                wsBackoff = Math.min(30000, wsBackoff * 2);
+                console.warn(`⚠️ WebSocket closed. Reconnecting in ${(delay / 1000).toFixed(1)}s...`);
+                // Back to the fast poll until the socket returns
+                if (watchingPrompt) {
+                    clearTimeout(pollTimer);
+                    schedulePolling();
+                }
+                setTimeout(reconnectWebSocket, delay);
+            };
+
+            ws.onerror = (err) => {
                 wsConnected = false;
                 console.warn('WebSocket error:', err);
-            }};
+            };
+
+            ws.onmessage = (evt) => {
+                const raw = evt.data;
+                if (typeof raw !== 'string') return;
+                // Several frames per sampler step; drop ones about another
+                // prompt before paying for a parse
+                if (currentPromptId && raw.indexOf('"prompt_id"') !== -1 && raw.indexOf(currentPromptId) === -1) return;
 
-            ws.onmessage = (evt) => {{
                 let msg;
-                try {{ msg = JSON.parse(evt.data); }} catch {{ return; }}
+                try { msg = JSON.parse(raw); } catch { return; }
                 if (!msg || !msg.type) return;
 
-                const data = msg.data || {{}};
+                const data = msg.data || {};
                 const pid = data.prompt_id || data.promptId || null;
                 if (currentPromptId && pid && pid !== currentPromptId) return; // ignore other prompts
 
-                if (msg.type === 'progress') {{
-                    // {{ value, max }}
+                if (msg.type === 'progress') {
+                    // { value, max }
                     const v = Number(data.value);
                     const mx = Number(data.max);
-                    if (isFinite(v) && isFinite(mx) && mx > 0) {{
+                    if (isFinite(v) && isFinite(mx) && mx > 0) {
                         const pct = (v / mx) * 100;
-                        updateProgressUI(pct, `Generating... ${{Math.round(pct)}}%`);
-                    }}
-                }} else if (msg.type === 'executing') {{
+                        scheduleProgressUI(pct, `Generating... ${Math.round(pct)}%`);
+                    }
+                } else if (msg.type === 'executing') {
                     // When node is null, execution finished for prompt
-                    if (data.node === null && currentPromptId && (pid === currentPromptId || !pid)) {{
+                    if (data.node === null && currentPromptId && (pid === currentPromptId || !pid)) {
                         updateProgressUI(100, 'Finalizing...');
-                    }}
-                }} else if (msg.type === 'execution_start') {{
+                        // Sent after the result is in /history, for success
+                        // and failure alike
+                        if (watchingPrompt) checkPromptStatus();
+                    }
+                } else if (msg.type === 'execution_start') {
                     updateProgressUI(1, 'Starting...');
-                }} else if (msg.type === 'execution_cached') {{
+                } else if (msg.type === 'execution_cached') {
                     // Treat as progress bump
                     if (currentPromptId) updateProgressUI(5, 'Using cache...');
-                }} else if (msg.type === 'execution_success') {{
+                } else if (msg.type === 'execution_success') {
                     updateProgressUI(100, 'Done');
-                }} else if (msg.type === 'execution_error') {{
+                } else if (msg.type === 'execution_error') {
                     updateProgressUI(0, 'Error');
-                }}
-            }};
-        }}
+                }
+            };
+        }
 
         // --- Auto-load existing outputs into gallery ---
-        async function loadExistingFiles() {{
+        async function loadExistingFiles() {
             const galleryGrid = document.getElementById('galleryGrid');
             if (!galleryGrid) return;
 
-            
-            // Remove placeholder message if present
-            const placeholder = galleryGrid.querySelector('.text-muted');
-            if (placeholder) galleryGrid.innerHTML = '';
-try {{
-                const resp = await fetch(`${{CONFIG.serverUrl}}/history`);
-                if (!resp.ok) throw new Error(`history HTTP ${{resp.status}}`);
+            try {
+                // Only the latest 30 prompts are shown; have ComfyUI trim the
+                // history instead of sending all of it (older servers ignore this)
+                const resp = await fetch(`${CONFIG.serverUrl}/history?max_items=30`);
+                if (!resp.ok) throw new Error(`history HTTP ${resp.status}`);
                 const history = await resp.json();
 
-                const promptIds = Object.keys(history || {{}});
+                const promptIds = Object.keys(history || {});
                 if (!promptIds.length) return;
 
-                // Newest first (prompt ids are usually sortable as strings)
-                promptIds.sort().reverse();
+                // Newest first. Prompt ids are random UUIDs, so sorting them
+                // means nothing; ComfyUI returns history in run order, which
+                // makes the newest simply the last keys.
+                const newestIds = promptIds.slice(-30).reverse();
 
-                const seen = new Set(galleryItems.map(x => (x.file && x.file.filename) ? x.file.filename : ''));
                 let added = 0;
+                // Items are built off-document and inserted in one go
+                const batch = document.createDocumentFragment();
 
-                for (const pid of promptIds.slice(0, 30)) {{
+                for (const pid of newestIds) {
                     const promptData = history[pid];
                     if (!promptData || !promptData.outputs) continue;
 
-                    const outputs = promptData.outputs || {{}};
-                    for (const out of Object.values(outputs)) {{
-                        if (out.images) {{
-                            for (const img of out.images) {{
-                                if (img && img.filename && !seen.has(img.filename)) {{
-                                    addToGallery(img, 'image', false);
-                                    seen.add(img.filename);
+                    const outputs = promptData.outputs || {};
+                    for (const out of Object.values(outputs)) {
+                        if (out.images) {
+                            for (const img of out.images) {
+                                if (img && img.filename && !galleryFilenames.has(img.filename)) {
+                                    addToGallery(img, 'image', false, batch);
                                     added++;
-                                }}
-                            }}
-                        }}
-                        if (out.gifs) {{
-                            for (const gif of out.gifs) {{
-                                if (gif && gif.filename && !seen.has(gif.filename)) {{
-                                    addToGallery(gif, 'gif', false);
-                                    seen.add(gif.filename);
+                                }
+                            }
+                        }
+                        if (out.gifs) {
+                            for (const gif of out.gifs) {
+                                if (gif && gif.filename && !galleryFilenames.has(gif.filename)) {
+                                    addToGallery(gif, 'gif', false, batch);
                                     added++;
-                                }}
-                            }}
-                        }}
-                        if (out.videos) {{
-                            for (const vid of out.videos) {{
-                                if (vid && vid.filename && !seen.has(vid.filename)) {{
-                                    addToGallery(vid, 'video', false);
-                                    seen.add(vid.filename);
+                                }
+                            }
+                        }
+                        if (out.videos) {
+                            for (const vid of out.videos) {
+                                if (vid && vid.filename && !galleryFilenames.has(vid.filename)) {
+                                    addToGallery(vid, 'video', false, batch);
                                     added++;
-                                }}
-                            }}
-                        }}
-                        if (out.audio) {{
-                            for (const aud of out.audio) {{
-                                if (aud && aud.filename && !seen.has(aud.filename)) {{
-                                    addToGallery(aud, 'audio', false);
-                                    seen.add(aud.filename);
+                                }
+                            }
+                        }
+                        if (out.audio) {
+                            for (const aud of out.audio) {
+                                if (aud && aud.filename && !galleryFilenames.has(aud.filename)) {
+                                    addToGallery(aud, 'audio', false, batch);
                                     added++;
-                                }}
-                            }}
-                        }}
-                    }}
-                    if (added >= 50) break;
-                }}
-
-                if (added > 0) {{
+                                }
+                            }
+                        }
+                    }
+                    if (added >= GALLERY_LIMIT) break;
+                }
+
+                if (added > 0) {
                     // Clear placeholder text if present
-                    if (galleryGrid.querySelector('.text-muted')) {{
-                        galleryGrid.innerHTML = '';
-                        // Re-render from galleryItems (they were appended while placeholder existed)
-                        // Easiest: just reload page order: remove placeholder already, so items should show.
-                    }}
-                    setupLightbox();
-                    initAllVideoThumbnails();
-                }}
-            }} catch (e) {{
+                    if (galleryEmpty) galleryEmpty.remove();
+                    const newVideos = batch.querySelectorAll('video.video-thumb');
+                    galleryGrid.appendChild(batch);
+                    trimGallery(galleryGrid);
+                    whenIdle(() => {
+                        setupLightbox();
+                        newVideos.forEach(observeVideoThumbnail);
+                    });
+                }
+            } catch (e) {
                 console.warn('Failed to load existing files:', e);
-            }}
-        }}
+            }
+        }
 
         // --- Video thumbnail handling ---
-        function initAllVideoThumbnails() {{
-            document.querySelectorAll('video.video-thumb').forEach(v => initVideoThumbnail(v));
-        }}
+        // Gallery videos only start downloading once they are near the viewport
+        const videoThumbObserver = ('IntersectionObserver' in window)
+            ? new IntersectionObserver((entries, observer) => {
+                entries.forEach(entry => {
+                    if (!entry.isIntersecting) return;
+                    observer.unobserve(entry.target);
+                    startVideoThumbnail(entry.target);
+                });
+            }, { rootMargin: '200px' })
+            : null;
+
+        function startVideoThumbnail(video) {
+            if (video.dataset.src && !video.getAttribute('src')) video.src = video.dataset.src;
+            initVideoThumbnail(video);
+        }
+
+        function observeVideoThumbnail(video) {
+            if (videoThumbObserver) videoThumbObserver.observe(video);
+            else startVideoThumbnail(video);
+        }
+
+        function initAllVideoThumbnails() {
+            document.querySelectorAll('video.video-thumb').forEach(observeVideoThumbnail);
+        }
+
+        // Thumbnails that never load are given up on after a while. All of them
+        // share one sweep timer instead of holding a timer each.
+        const thumbTimeouts = new Map(); // video -> [deadline, onTimeout]
+        let thumbSweepTimer = null;
 
-        function initVideoThumbnail(video) {{
+        function addThumbTimeout(video, ms, onTimeout) {
+            thumbTimeouts.set(video, [Date.now() + ms, onTimeout]);
+            if (!thumbSweepTimer) thumbSweepTimer = setInterval(sweepThumbTimeouts, 250);
+        }
+
+        function sweepThumbTimeouts() {
+            const now = Date.now();
+            thumbTimeouts.forEach(([deadline, onTimeout], video) => {
+                if (now < deadline) return;
+                thumbTimeouts.delete(video);
+                onTimeout();
+            });
+            if (!thumbTimeouts.size) {
+                clearInterval(thumbSweepTimer);
+                thumbSweepTimer = null;
+            }
+        }
+
+        function initVideoThumbnail(video) {
             if (!video || video.dataset.thumbInit === '1') return;
             video.dataset.thumbInit = '1';
 
@@ -2003,94 +2327,115 @@ try {{
             video.classList.add('video-thumb');
             video.classList.add('loading');
 
-            let hasError = false;
-            let thumbTime = 0.1;
+            // Kept on the element: the gallery's hover handler reads it too
+            const hasError = () => video.dataset.thumbError === '1';
+            const markError = () => { video.dataset.thumbError = '1'; };
 
-            const computeThumbTime = () => {{
+            const computeThumbTime = () => {
                 const d = Number(video.duration);
                 if (!isFinite(d) || d <= 0) return 0.1;
                 // 0.1s or ~1% into the clip; keep inside [0, d-0.05]
                 const t = Math.max(0.1, d * 0.01);
                 return Math.min(t, Math.max(0, d - 0.05));
-            }};
+            };
 
-            const applyThumbTime = (t) => {{
-                try {{
+            const applyThumbTime = (t) => {
+                try {
                     video.dataset.thumbTime = String(t);
-                    thumbTime = t;
                     // Seeking needs the media pipeline ready
                     video.currentTime = t;
-                }} catch (e) {{}}
-            }};
+                } catch (e) {}
+            };
 
-            const showVideo = () => {{
+            const showVideo = () => {
                 video.classList.remove('loading');
-            }};
+                thumbTimeouts.delete(video);
+            };
 
             // Handle video loading error - show video anyway with play button overlay
-            video.addEventListener('error', () => {{
-                hasError = true;
+            video.addEventListener('error', () => {
+                markError();
                 showVideo();
                 console.warn('Video thumbnail error for:', video.src);
-            }}, {{ once: true }});
+            }, { once: true });
 
             // When metadata is loaded (duration available)
-            video.addEventListener('loadedmetadata', () => {{
+            video.addEventListener('loadedmetadata', () => {
                 const t = computeThumbTime();
                 applyThumbTime(t);
-            }}, {{ once: true }});
+            }, { once: true });
 
             // When enough data is loaded to render the current frame
-            video.addEventListener('loadeddata', () => {{
-                if (!hasError) {{
+            video.addEventListener('loadeddata', () => {
+                if (!hasError()) {
                     const t = computeThumbTime();
                     applyThumbTime(t);
-                }}
-            }}, {{ once: true }});
+                }
+            }, { once: true });
 
             // After seeking, pause on that frame as the thumbnail
-            video.addEventListener('seeked', () => {{
+            video.addEventListener('seeked', () => {
                 video.pause();
                 showVideo();
-            }});
+            });
+
+            // Show it as soon as a frame is actually on screen
+            if ('requestVideoFrameCallback' in video) {
+                video.requestVideoFrameCallback(showVideo);
+            }
 
             // Fallback: if video takes too long, show it anyway
-            setTimeout(() => {{
-                if (video.classList.contains('loading')) {{
+            addThumbTimeout(video, 5000, () => {
+                if (video.classList.contains('loading')) {
                     showVideo();
                     // If video is still not showing (possibly due to CORS), trigger error display
-                    if (video.videoWidth === 0 && video.readyState < 2) {{
-                        hasError = true;
+                    if (video.videoWidth === 0 && video.readyState < 2) {
+                        markError();
                         const fallback = video.nextElementSibling;
-                        if (fallback && fallback.classList.contains('video-fallback')) {{
+                        if (fallback && fallback.classList.contains('video-fallback')) {
                             fallback.style.display = 'flex';
                             video.style.display = 'none';
-                        }}
-                    }}
-                }}
-            }}, 5000);
+                        }
+                    }
+                }
+            });
 
             // Trigger load in case the element was added dynamically
-            try {{ video.load(); }} catch {{}}
-
-            // Hover-to-play with restore thumbnail on leave
-            const parent = video.closest('.gallery-item') || video;
+            try { video.load(); } catch {}
+        }
 
-            parent.addEventListener('mouseenter', () => {{
-                if (!hasError) {{
-                    video.play().catch(() => {{}});
-                }}
-            }});
+        // Hover-to-play with restore thumbnail on leave, for every gallery
+        // video through one pair of listeners on the grid
+        function setupGalleryHover() {
+            const galleryGrid = document.getElementById('galleryGrid');
+            if (!galleryGrid) return;
 
-            parent.addEventListener('mouseleave', () => {{
+            const hoveredVideo = (e) => {
+                const item = e.target.closest('.gallery-item');
+                // Ignore moves between elements inside the same item
+                if (!item || item.contains(e.relatedTarget)) return null;
+                const video = item.querySelector('video.video-thumb');
+                return (video && video.dataset.thumbInit === '1') ? video : null;
+            };
+
+            galleryGrid.addEventListener('mouseover', (e) => {
+                const video = hoveredVideo(e);
+                if (video && video.dataset.thumbError !== '1') {
+                    video.play().catch(() => {});
+                }
+            });
+
+            galleryGrid.addEventListener('mouseout', (e) => {
+                const video = hoveredVideo(e);
+                if (!video) return;
                 video.pause();
-                if (!hasError) {{
-                    try {{ video.currentTime = thumbTime; }} catch {{}}
-                }}
-            }});
-        }}
+                if (video.dataset.thumbError !== '1') {
+                    try { video.currentTime = Number(video.dataset.thumbTime) || 0.1; } catch {}
+                }
+            });
+        }
 // Theme toggle
-        function toggleTheme() {{
+        function toggleTheme() {
             const html = document.documentElement;
             const currentTheme = html.getAttribute('data-theme');
             const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
@@ -2098,742 +2443,1087 @@ try {{
             localStorage.setItem('theme', newTheme);
             const themeText = document.getElementById('theme-text');
             if (themeText) themeText.textContent = newTheme === 'dark' ? 'Light' : 'Dark';
-        }}
+        }
         
-        function loadTheme() {{
+        function loadTheme() {
             const savedTheme = localStorage.getItem('theme') || 'light';
             document.documentElement.setAttribute('data-theme', savedTheme);
             const themeText = document.getElementById('theme-text');
             if (themeText) themeText.textContent = savedTheme === 'dark' ? 'Light' : 'Dark';
-        }}
+        }
         
         // Category collapse
-        function toggleCategory(categoryId) {{
+        function toggleCategory(categoryId) {
             const content = document.getElementById('content_' + categoryId);
             const icon = document.getElementById('collapse_' + categoryId);
             const section = document.getElementById('section_' + categoryId);
             
-            if (content.classList.contains('collapsed')) {{
+            if (content.classList.contains('collapsed')) {
                 content.classList.remove('collapsed');
                 section.classList.remove('collapsed');
-            }} else {{
+            } else {
                 content.classList.add('collapsed');
                 section.classList.add('collapsed');
-            }}
-        }}
+            }
+        }
         
         // Bypass handling
-        function handleBypass(bypassId) {{
+        function handleBypass(bypassId) {
             const checkbox = document.getElementById(bypassId);
             const toggle = bypassToggles.find(t => t.id === bypassId);
             
-            if (toggle) {{
-                console.log(`${{checkbox.checked ? 'Bypassing' : 'Enabling'}} nodes:`, toggle.nodes);
-            }}
-        }}
+            if (toggle) {
+                console.log(`${checkbox.checked ? 'Bypassing' : 'Enabling'} nodes:`, toggle.nodes);
+            }
+        }
         
         // Slider updates
-        function updateSlider(sliderId) {{
+        // Parameter inputs report edits through these two listeners on their
+        // section rather than an inline handler each
+        function setupParamListeners() {
+            const section = document.getElementById('parametersSection');
+            if (!section) return;
+            
+            section.addEventListener('input', (e) => {
+                const target = e.target;
+                if (target.dataset.kind === 'slider') updateSlider(target.id);
+            });
+            section.addEventListener('change', (e) => {
+                const target = e.target;
+                switch (target.dataset.kind) {
+                    case 'upload-file':
+                        handleUpload(target.dataset.param, target, target.dataset.uploadType);
+                        break;
+                    case 'upload-select':
+                        handleSelect(target.id, target.value, target.dataset.uploadType);
+                        autosaveParameters();
+                        break;
+                    default:
+                        if (target.dataset.autosave) autosaveParameters();
+                }
+            });
+            section.addEventListener('click', (e) => {
+                const button = e.target.closest('[data-action="reseed"]');
+                if (!button) return;
+                const input = document.getElementById(button.dataset.param);
+                if (!input) return;
+                input.value = randomSeed();
+                autosaveParameters();
+            });
+        }
+        
+        // Seeds stay below 10^12, as they always have
+        const seedBuffer = new BigUint64Array(1);
+        
+        function randomSeed() {
+            crypto.getRandomValues(seedBuffer);
+            return String(seedBuffer[0] % 1000000000000n);
+        }
+        
+        function updateSlider(sliderId) {
             const slider = document.getElementById(sliderId);
             const display = document.getElementById(sliderId + '_value');
-            if (slider && display) {{
+            if (slider && display) {
                 display.textContent = slider.value;
-                
-                // Update slider background gradient
-                const value = (slider.value - slider.min) / (slider.max - slider.min) * 100;
-                slider.style.background = `linear-gradient(to right, var(--primary) 0%, var(--primary) ${{value}}%, var(--border) ${{value}}%, var(--border) 100%)`;
+                setSliderFill(slider);
                 
                 if (CONFIG.features.autosave) autosaveParameters();
-            }}
-        }}
+            }
+        }
         
-        function updateAllSliders() {{
-            document.querySelectorAll('input[type="range"]').forEach(slider => {{
-                const value = (slider.value - slider.min) / (slider.max - slider.min) * 100;
-                slider.style.background = `linear-gradient(to right, var(--primary) 0%, var(--primary) ${{value}}%, var(--border) ${{value}}%, var(--border) 100%)`;
-            }});
-        }}
+        function updateAllSliders() {
+            document.querySelectorAll('input[type="range"]').forEach(setSliderFill);
+        }
+
+        // The track gradient lives in the stylesheet; only its fill point changes
+        function setSliderFill(slider) {
+            const value = (slider.value - slider.min) / (slider.max - slider.min) * 100;
+            slider.style.setProperty('--fill', value + '%');
+        }
+
+        // Display and fill of a slider whose value was set from code. Bulk
+        // updates set every value first and call this once per slider after.
+        function syncSlider(slider) {
+            const display = document.getElementById(slider.id + '_value');
+            if (display) display.textContent = slider.value;
+            setSliderFill(slider);
+        }
         
+        // An upload parameter's controls: the file dropdown (its id is the
+        // param id), the hidden input holding the uploaded filename, the file
+        // picker and the preview. Looked up once per field.
+        class UploadField {
+            constructor(paramId, uploadType = 'image') {
+                this.uploadType = uploadType;
+                this.label = uploadType.charAt(0).toUpperCase() + uploadType.slice(1);
+                this.icon = uploadType === 'audio' ? '🎵' : '🖼️';
+                this.select = document.getElementById(paramId);
+                this.hiddenInput = document.getElementById(paramId + '_uploaded');
+                this.fileInput = document.getElementById(paramId + '_file');
+                this.preview = document.getElementById(paramId + '_preview');
+                this.previewImg = document.getElementById(paramId + '_preview_img');
+                this.previewAudio = document.getElementById(paramId + '_preview_audio');
+            }
+
+            // A blob: preview URL keeps its file in memory until revoked
+            releasePreview() {
+                const hiddenInput = this.hiddenInput;
+                if (!hiddenInput) return;
+                if (hiddenInput.dataset.fileData) URL.revokeObjectURL(hiddenInput.dataset.fileData);
+                delete hiddenInput.dataset.fileData;
+            }
+
+            hidePreview() {
+                if (this.preview) this.preview.style.display = 'none';
+            }
+
+            // Back to the dropdown's default, with no file picked
+            reset() {
+                if (this.select && this.select.dataset.default) {
+                    this.select.value = this.select.dataset.default;
+                }
+                if (this.hiddenInput) {
+                    this.hiddenInput.value = '';
+                    this.releasePreview();
+                }
+                if (this.fileInput) this.fileInput.value = '';
+                this.hidePreview();
+            }
+
+            // Saved state; the uploaded filename is kept for autosave only,
+            // presets just remember the dropdown
+            serialize(withUploadedFile = false) {
+                const saved = {
+                    selectValue: this.select ? this.select.value : '',
+                    uploadType: this.uploadType,
+                    isUpload: true
+                };
+                if (withUploadedFile) saved.uploadedFile = this.hiddenInput ? this.hiddenInput.value : '';
+                return saved;
+            }
+
+            // Note: a file object can't be restored from storage, only its name
+            restore(saved) {
+                if (this.select && saved.selectValue) this.select.value = saved.selectValue;
+                if (this.hiddenInput && saved.uploadedFile) this.hiddenInput.value = saved.uploadedFile;
+            }
+
+            // What generate() should send: { source, value } with source one
+            // of 'uploaded', 'selected', 'pending' (picked but not uploaded
+            // yet, or the upload failed) or 'missing'
+            resolveValue() {
+                const uploadedName = this.hiddenInput ? this.hiddenInput.value : '';
+                if (uploadedName) {
+                    const source = this.hiddenInput.dataset.uploaded === 'true' ? 'uploaded' : 'pending';
+                    return { source, value: uploadedName };
+                }
+                if (this.select && this.select.value) return { source: 'selected', value: this.select.value };
+                return { source: 'missing', value: '' };
+            }
+        }
+
+        const uploadFields = new Map();
+
+        function getUploadField(paramId, uploadType = 'image') {
+            let field = uploadFields.get(paramId);
+            if (!field) {
+                field = new UploadField(paramId, uploadType);
+                uploadFields.set(paramId, field);
+            }
+            return field;
+        }
+
         // Image upload handling - Actually uploads file to ComfyUI
-            async function handleUpload(paramId, fileInput, uploadType = 'image') {{
+
+            async function handleUpload(paramId, fileInput, uploadType = 'image') {
                 const file = fileInput.files[0];
                 if (!file) return;
 
-                const previewContainer = document.getElementById(paramId + '_preview');
-                const previewImg = document.getElementById(paramId + '_preview_img');
-                const previewAudio = document.getElementById(paramId + '_preview_audio');
-                const hiddenInput = document.getElementById(paramId + '_uploaded');
-                const select = document.getElementById(paramId);
+                const field = getUploadField(paramId, uploadType);
+                const { hiddenInput, select } = field;
 
-                // Create object URL for preview
+                // Create object URL for preview, dropping the previous one
+                field.releasePreview();
                 const objectUrl = URL.createObjectURL(file);
+                hiddenInput.dataset.fileData = objectUrl;
                 
                 // Handle preview based on type
-                if (uploadType === 'audio' && previewAudio) {{
-                    previewAudio.src = objectUrl;
-                }} else if (previewImg) {{
-                    previewImg.src = objectUrl;
-                }}
-                previewContainer.style.display = 'block';
+                if (uploadType === 'audio' && field.previewAudio) {
+                    field.previewAudio.src = objectUrl;
+                } else if (field.previewImg) {
+                    field.previewImg.src = objectUrl;
+                }
+                field.preview.style.display = 'block';
 
                 const typeLabel = uploadType === 'audio' ? 'Audio' : 'Image';
-                showStatus(`Uploading "${{file.name}}" to ComfyUI...`, 'success');
+                showStatus(`Uploading "${file.name}" to ComfyUI...`, 'success');
 
-                try {{
+                try {
                     // Upload file to ComfyUI
                     const formData = new FormData();
                     formData.append('image', file);
                     formData.append('type', 'input');
                     formData.append('overwrite', 'true');
 
-                    const uploadResponse = await fetch(`${{CONFIG.serverUrl}}/upload/image`, {{
+                    const uploadResponse = await fetch(`${CONFIG.serverUrl}/upload/image`, {
                         method: 'POST',
                         body: formData
-                    }});
+                    });
 
-                    if (!uploadResponse.ok) {{
+                    if (!uploadResponse.ok) {
                         const errorText = await uploadResponse.text();
-                        throw new Error(`Upload failed: ${{uploadResponse.status}} - ${{errorText}}`);
-                    }}
+                        throw new Error(`Upload failed: ${uploadResponse.status} - ${errorText}`);
+                    }
 
                     const uploadResult = await uploadResponse.json();
-                    console.log(`✅ ${{typeLabel}} uploaded successfully:`, uploadResult);
+                    console.log(`✅ ${typeLabel} uploaded successfully:`, uploadResult);
 
                     // Store the uploaded filename (ComfyUI may rename it)
                     const uploadedFilename = uploadResult.name || file.name;
                     hiddenInput.value = uploadedFilename;
-                    hiddenInput.dataset.fileData = objectUrl;
                     hiddenInput.dataset.uploaded = 'true';
 
                     // Update the select dropdown to show the uploaded file
-                    if (select) {{
+                    if (select) {
                         // Check if option already exists
-                        let option = select.querySelector(`option[value="${{uploadedFilename}}"]`);
-                        if (!option) {{
+                        let option = select.querySelector(`option[value="${uploadedFilename}"]`);
+                        if (!option) {
                             // Add new option
                             option = document.createElement('option');
                             option.value = uploadedFilename;
                             option.textContent = uploadedFilename;
                             select.appendChild(option);
-                        }}
+                        }
                         // Select the uploaded file
                         select.value = uploadedFilename;
-                    }}
+                    }
 
-                    showStatus(`${{typeLabel}} "${{uploadedFilename}}" uploaded successfully!`, 'success');
+                    showStatus(`${typeLabel} "${uploadedFilename}" uploaded successfully!`, 'success');
                     if (CONFIG.features.autosave) autosaveParameters();
 
-                }} catch (error) {{
-                    console.error(`❌ ${{typeLabel}} upload failed:`, error);
-                    showStatus(`Upload failed: ${{error.message}}`, 'error');
+                } catch (error) {
+                    console.error(`❌ ${typeLabel} upload failed:`, error);
+                    showStatus(`Upload failed: ${error.message}`, 'error');
                     // Still keep the preview but mark as not uploaded
                     hiddenInput.value = file.name;
-                    hiddenInput.dataset.fileData = objectUrl;
                     hiddenInput.dataset.uploaded = 'false';
                     // Still update select to show the filename
-                    if (select) {{
+                    if (select) {
                         select.value = file.name;
-                    }}
-                }}
-            }}
+                    }
+                }
+            }
 
-            function handleSelect(paramId, value, uploadType = 'image') {{
+            function handleSelect(paramId, value, uploadType = 'image') {
                 if (!value) return;
 
-                const previewContainer = document.getElementById(paramId + '_preview');
-                const hiddenInput = document.getElementById(paramId + '_uploaded');
+                const field = getUploadField(paramId, uploadType);
 
                 // Hide preview and clear uploaded file
-                previewContainer.style.display = 'none';
-                hiddenInput.value = '';
-                delete hiddenInput.dataset.fileData;
+                field.hidePreview();
+                field.hiddenInput.value = '';
+                field.releasePreview();
 
                 const typeLabel = uploadType === 'audio' ? 'Audio' : 'Image';
-                showStatus(`${{typeLabel}} "${{value}}" selected from history`, 'success');
-            }}
+                showStatus(`${typeLabel} "${value}" selected from history`, 'success');
+            }
 
-            function clearUpload(paramId, uploadType = 'image') {{
-                const fileInput = document.getElementById(paramId + '_file');
-                const previewContainer = document.getElementById(paramId + '_preview');
-                const previewImg = document.getElementById(paramId + '_preview_img');
-                const previewAudio = document.getElementById(paramId + '_preview_audio');
-                const hiddenInput = document.getElementById(paramId + '_uploaded');
-                const select = document.getElementById(paramId);
+            function clearUpload(paramId, uploadType = 'image') {
+                const field = getUploadField(paramId, uploadType);
 
                 // Clear file input
-                fileInput.value = '';
+                field.fileInput.value = '';
 
                 // Hide preview
-                previewContainer.style.display = 'none';
-                if (previewImg) previewImg.src = '';
-                if (previewAudio) previewAudio.src = '';
+                field.hidePreview();
+                if (field.previewImg) field.previewImg.src = '';
+                if (field.previewAudio) field.previewAudio.src = '';
 
                 // Clear hidden input and upload status
-                hiddenInput.value = '';
-                delete hiddenInput.dataset.fileData;
-                delete hiddenInput.dataset.uploaded;
+                field.hiddenInput.value = '';
+                field.releasePreview();
+                delete field.hiddenInput.dataset.uploaded;
 
                 // Reset select to empty
-                if (select) {{
-                    select.value = '';
-                }}
+                if (field.select) {
+                    field.select.value = '';
+                }
 
                 const typeLabel = uploadType === 'audio' ? 'Audio' : 'Image';
-                showStatus(`${{typeLabel}} upload cleared`, 'info');
+                showStatus(`${typeLabel} upload cleared`, 'info');
                 if (CONFIG.features.autosave) autosaveParameters();
-            }}
+            }
         
         // Parameter autosave
-        function autosaveParameters() {{
+        // Sliders ask for a save on every step of a drag (updateSlider, from
+        // the input event); other fields only on change. Save once they go
+        // quiet, and only the parameters that actually changed. Each one has
+        // its own localStorage key, so a slider drag rewrites one small value.
+        const AUTOSAVE_PREFIX = 'autosave:';
+        const LEGACY_AUTOSAVE_KEY = 'autosave_params';
+        const AUTOSAVE_DELAY = 300;
+        // A slider drag that never pauses for AUTOSAVE_DELAY is still saved
+        // this often; change events are one-offs and never hit this
+        const AUTOSAVE_MAX_WAIT = 2000;
+        let autosaveTimer = null;
+        let autosavePendingSince = 0;
+        const lastAutosave = new Map(); // param id -> comparable form of the saved value
+
+        // Upload fields save an object; compare it by the parts that change
+        function autosaveKey(value) {
+            return value && typeof value === 'object' ? value.selectValue + '\\0' + value.uploadedFile : value;
+        }
+
+        function autosaveParameters() {
             if (!CONFIG.features.autosave) return;
-            
-            const params = {{}};
-            paramMap.forEach(param => {{
-                if (param.has_upload) {{
+            const now = Date.now();
+            if (autosaveTimer === null) autosavePendingSince = now;
+            clearTimeout(autosaveTimer);
+            const maxWaitLeft = autosavePendingSince + AUTOSAVE_MAX_WAIT - now;
+            autosaveTimer = setTimeout(flushAutosave, Math.max(0, Math.min(AUTOSAVE_DELAY, maxWaitLeft)));
+        }
+
+        function flushAutosave() {
+            clearTimeout(autosaveTimer);
+            autosaveTimer = null;
+            const params = buildAutosaveParams();
+            for (const id in params) {
+                const key = autosaveKey(params[id]);
+                if (lastAutosave.get(id) === key) continue;
+                localStorage.setItem(AUTOSAVE_PREFIX + id, JSON.stringify(params[id]));
+                lastAutosave.set(id, key);
+            }
+        }
+
+        // Don't lose edits made in the last 300 ms before the tab goes away.
+        // Mobile browsers may discard a backgrounded tab without pagehide,
+        // so going hidden counts too.
+        function flushPendingAutosave() {
+            if (autosaveTimer !== null) flushAutosave();
+        }
+        window.addEventListener('pagehide', flushPendingAutosave);
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') flushPendingAutosave();
+        });
+
+        // The workflow template is parsed on first use. Each generate() works on
+        // a copy that duplicates only the node objects and their inputs, the
+        // levels generate() writes to; link arrays and the rest stay shared.
+        let workflowTemplate = null;
+
+        function copyWorkflowTemplate() {
+            if (!workflowTemplate) workflowTemplate = readPageData('workflow-data');
+            const workflow = {};
+            for (const nodeId in workflowTemplate) {
+                const node = workflowTemplate[nodeId];
+                workflow[nodeId] = node && node.inputs ? { ...node, inputs: { ...node.inputs } } : { ...node };
+            }
+            return workflow;
+        }
+
+        // Parameter inputs are never replaced after load, so look them up once
+        let paramElementCache = null;
+
+        function getParamElements() {
+            if (!paramElementCache) {
+                paramElementCache = new Map();
+                paramMap.forEach(param => {
+                    paramElementCache.set(param.id, {
+                        param,
+                        element: document.getElementById(param.id),
+                        upload: param.has_upload ? getUploadField(param.id, param.upload_type || 'image') : null
+                    });
+                });
+            }
+            return paramElementCache;
+        }
+
+        // The same entries split by how generate() reads them, so its loops
+        // don't re-branch on upload/input type for every parameter
+        let paramGroupCache = null;
+
+        function getParamGroups() {
+            if (!paramGroupCache) {
+                const groups = { uploads: [], checkboxes: [], numbers: [], strings: [] };
+                getParamElements().forEach(entry => {
+                    const { param, element } = entry;
+                    if (param.has_upload) {
+                        groups.uploads.push(entry);
+                    } else if (!element) {
+                        return;
+                    } else if (element.type === 'checkbox') {
+                        groups.checkboxes.push(entry);
+                    } else if (element.type === 'number' || element.type === 'range') {
+                        groups.numbers.push(entry);
+                    } else {
+                        groups.strings.push(entry);
+                    }
+                });
+                paramGroupCache = groups;
+            }
+            return paramGroupCache;
+        }
+
+        function buildAutosaveParams() {
+            const params = {};
+            getParamElements().forEach(({ param, element, upload }) => {
+                if (upload) {
                     // For upload fields (image or audio), save both select value and uploaded file
-                    const selectElement = document.getElementById(param.id);
-                    const uploadedInput = document.getElementById(param.id + '_uploaded');
-                    params[param.id] = {{
-                        selectValue: selectElement ? selectElement.value : '',
-                        uploadedFile: uploadedInput ? uploadedInput.value : '',
-                        uploadType: param.upload_type || 'image',
-                        isUpload: true
-                    }};
-                }} else {{
-                    const element = document.getElementById(param.id);
-                    if (element) {{
-                        params[param.id] = element.type === 'checkbox' ? element.checked : element.value;
-                    }}
-                }}
-            }});
-            
-            localStorage.setItem('autosave_params', JSON.stringify(params));
-        }}
+                    params[param.id] = upload.serialize(true);
+                } else if (element) {
+                    params[param.id] = element.type === 'checkbox' ? element.checked : element.value;
+                }
+            });
+            return params;
+        }
         
-        function loadAutosave() {{
-            const saved = localStorage.getItem('autosave_params');
-            if (!saved) return;
-            
-            try {{
-                const params = JSON.parse(saved);
-                Object.keys(params).forEach(id => {{
+        // This page's saved values, from the per-parameter keys or, if there are
+        // none yet, from the single object older pages saved
+        function readAutosave(elements) {
+            const params = {};
+            let found = false;
+            elements.forEach((entry, id) => {
+                const saved = localStorage.getItem(AUTOSAVE_PREFIX + id);
+                if (saved === null) return;
+                params[id] = JSON.parse(saved);
+                lastAutosave.set(id, autosaveKey(params[id]));
+                found = true;
+            });
+            if (found) return params;
+            const legacy = localStorage.getItem(LEGACY_AUTOSAVE_KEY);
+            return legacy ? JSON.parse(legacy) : null;
+        }
+
+        function loadAutosave() {
+            try {
+                const elements = getParamElements();
+                const params = readAutosave(elements);
+                if (!params) return;
+                const sliders = [];
+                Object.keys(params).forEach(id => {
                     const value = params[id];
+                    // Saved by another page with different parameters
+                    const entry = elements.get(id);
+                    if (!entry) return;
                     
                     // Check if this is an upload field (object with isUpload flag)
-                    if (value && typeof value === 'object' && value.isUpload) {{
-                        const selectElement = document.getElementById(id);
-                        const uploadedInput = document.getElementById(id + '_uploaded');
-                        const uploadType = value.uploadType || 'image';
-                        
-                        if (selectElement && value.selectValue) {{
-                            selectElement.value = value.selectValue;
-                        }}
-                        if (uploadedInput && value.uploadedFile) {{
-                            uploadedInput.value = value.uploadedFile;
-                            // Note: Cannot restore file object from localStorage, only filename
-                        }}
-                    }} else {{
+                    if (value && typeof value === 'object' && value.isUpload) {
+                        if (entry.upload) entry.upload.restore(value);
+                    } else {
                         // Standard parameter handling
-                        const element = document.getElementById(id);
-                        if (element) {{
-                            if (element.type === 'checkbox') {{
+                        const element = entry.element;
+                        if (element) {
+                            if (element.type === 'checkbox') {
                                 element.checked = value;
-                            }} else {{
+                            } else {
                                 element.value = value;
-                                if (element.type === 'range') {{
-                                    updateSlider(id);
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
+                                if (element.type === 'range') sliders.push(element);
+                            }
+                        }
+                    }
+                });
+                sliders.forEach(syncSlider);
                 console.log('✅ Loaded autosaved parameters');
-            }} catch (e) {{
+            } catch (e) {
                 console.error('Failed to load autosave:', e);
-            }}
-        }}
+            }
+        }
         
         // Reset parameters
-        function resetParameters() {{
+        function resetParameters() {
             if (!confirm('Reset all parameters to default values?')) return;
             
-            paramMap.forEach(param => {{
-                if (param.has_upload) {{
+            const sliders = [];
+            getParamElements().forEach(({ element, upload }) => {
+                if (upload) {
                     // Reset upload fields (image or audio)
-                    const selectElement = document.getElementById(param.id);
-                    const uploadedInput = document.getElementById(param.id + '_uploaded');
-                    const fileInput = document.getElementById(param.id + '_file');
-                    const previewContainer = document.getElementById(param.id + '_preview');
-                    
-                    if (selectElement && selectElement.dataset.default) {{
-                        selectElement.value = selectElement.dataset.default;
-                    }}
-                    if (uploadedInput) {{
-                        uploadedInput.value = '';
-                        delete uploadedInput.dataset.fileData;
-                    }}
-                    if (fileInput) {{
-                        fileInput.value = '';
-                    }}
-                    if (previewContainer) {{
-                        previewContainer.style.display = 'none';
-                    }}
-                }} else {{
+                    upload.reset();
+                } else {
                     // Standard parameter handling
-                    const element = document.getElementById(param.id);
-                    if (element && element.dataset.default) {{
-                        if (element.type === 'checkbox') {{
+                    if (element && element.dataset.default) {
+                        if (element.type === 'checkbox') {
                             element.checked = element.dataset.default === 'true';
-                        }} else {{
+                        } else {
                             element.value = element.dataset.default;
-                            if (element.type === 'range') {{
-                                updateSlider(param.id);
-                            }}
-                        }}
-                    }}
-                }}
-            }});
+                            if (element.type === 'range') sliders.push(element);
+                        }
+                    }
+                }
+            });
+            sliders.forEach(syncSlider);
             
             if (CONFIG.features.autosave) autosaveParameters();
             showStatus('Parameters reset to defaults', 'success');
-        }}
+        }
         
         // Preset system
-        function savePreset() {{
+        // --- Preset storage ---
+        // One IndexedDB record per preset, so saving or deleting one doesn't
+        // rewrite all of them. Where IndexedDB is unavailable (some browsers
+        // block it for file:// pages) presets fall back to localStorage.
+        const presetStore = (() => {
+            const LEGACY_KEY = 'presets';
+            const MIGRATED_KEY = 'presets_idb_migrated';
+            const LOCAL_PREFIX = 'preset:';
+            const LOCAL_MIGRATED_KEY = 'presets_split';
+            let dbPromise = null;
+            let localNames = null;
+
+            const legacy = () => JSON.parse(localStorage.getItem(LEGACY_KEY) || '{}');
+
+            // Without IndexedDB each preset gets its own localStorage key, so a
+            // save or delete rewrites one preset rather than all of them. The
+            // names are scanned once and kept in memory.
+            function localIndex() {
+                if (!localNames) {
+                    localNames = new Set();
+                    for (let i = 0; i < localStorage.length; i++) {
+                        const key = localStorage.key(i);
+                        if (key.startsWith(LOCAL_PREFIX)) localNames.add(key.slice(LOCAL_PREFIX.length));
+                    }
+                    if (!localStorage.getItem(LOCAL_MIGRATED_KEY)) {
+                        const old = legacy();
+                        Object.keys(old).forEach(name => {
+                            if (localNames.has(name)) return;
+                            localStorage.setItem(LOCAL_PREFIX + name, JSON.stringify(old[name]));
+                            localNames.add(name);
+                        });
+                        localStorage.setItem(LOCAL_MIGRATED_KEY, '1');
+                    }
+                }
+                return localNames;
+            }
+
+            function run(db, mode, fn) {
+                return new Promise((resolve, reject) => {
+                    const tx = db.transaction('presets', mode);
+                    const req = fn(tx.objectStore('presets'));
+                    tx.oncomplete = () => resolve(req ? req.result : undefined);
+                    tx.onerror = tx.onabort = () => reject(tx.error);
+                });
+            }
+
+            // Copy presets saved before the switch; the old key is left for
+            // pages generated by earlier versions
+            async function migrate(db) {
+                if (!localStorage.getItem(MIGRATED_KEY)) {
+                    const old = legacy();
+                    await run(db, 'readwrite', store => {
+                        Object.keys(old).forEach(name => store.put(old[name], name));
+                    });
+                    localStorage.setItem(MIGRATED_KEY, '1');
+                }
+                return db;
+            }
+
+            function open() {
+                if (!dbPromise) {
+                    dbPromise = new Promise((resolve, reject) => {
+                        if (!window.indexedDB) return reject(new Error('IndexedDB unavailable'));
+                        const req = indexedDB.open('webui-generator', 1);
+                        req.onupgradeneeded = () => req.result.createObjectStore('presets');
+                        req.onsuccess = () => resolve(req.result);
+                        req.onerror = () => reject(req.error);
+                    }).then(migrate).catch(e => {
+                        console.warn('Presets: IndexedDB unavailable, using localStorage', e);
+                        return null;
+                    });
+                }
+                return dbPromise;
+            }
+
+            return {
+                async names() {
+                    const db = await open();
+                    return db ? run(db, 'readonly', store => store.getAllKeys()) : [...localIndex()];
+                },
+                async get(name) {
+                    const db = await open();
+                    if (db) return run(db, 'readonly', store => store.get(name));
+                    if (!localIndex().has(name)) return undefined;
+                    return JSON.parse(localStorage.getItem(LOCAL_PREFIX + name));
+                },
+                async put(name, params) {
+                    const db = await open();
+                    if (db) return run(db, 'readwrite', store => store.put(params, name));
+                    localStorage.setItem(LOCAL_PREFIX + name, JSON.stringify(params));
+                    localIndex().add(name);
+                },
+                async remove(name) {
+                    const db = await open();
+                    if (db) return run(db, 'readwrite', store => store.delete(name));
+                    localStorage.removeItem(LOCAL_PREFIX + name);
+                    localIndex().delete(name);
+                }
+            };
+        })();
+
+        async function savePreset() {
             const name = prompt('Enter preset name:');
             if (!name) return;
             
-            const params = {{}};
-            paramMap.forEach(param => {{
-                if (param.has_upload) {{
+            const params = {};
+            getParamElements().forEach(({ param, element, upload }) => {
+                if (upload) {
                     // For upload fields (image or audio), save select value only (not uploaded files)
-                    const selectElement = document.getElementById(param.id);
-                    params[param.id] = {{
-                        selectValue: selectElement ? selectElement.value : '',
-                        uploadType: param.upload_type || 'image',
-                        isUpload: true
-                    }};
-                }} else {{
-                    const element = document.getElementById(param.id);
-                    if (element) {{
+                    params[param.id] = upload.serialize();
+                } else {
+                    if (element) {
                         params[param.id] = element.type === 'checkbox' ? element.checked : element.value;
-                    }}
-                }}
-            }});
+                    }
+                }
+            });
             
-            const presets = JSON.parse(localStorage.getItem('presets') || '{{}}');
-            presets[name] = params;
-            localStorage.setItem('presets', JSON.stringify(presets));
+            try {
+                await presetStore.put(name, params);
+            } catch (e) {
+                showStatus(`Failed to save preset: ${e.message}`, 'error');
+                return;
+            }
             
-            loadPresetsList();
-            showStatus(`Preset "${{name}}" saved!`, 'success');
-        }}
+            await loadPresetsList();
+            showStatus(`Preset "${name}" saved!`, 'success');
+        }
         
-        function loadPreset() {{
+        async function loadPreset() {
             const select = document.getElementById('presetSelect');
             const name = select.value;
             if (!name) return;
             
-            const presets = JSON.parse(localStorage.getItem('presets') || '{{}}');
-            const params = presets[name];
+            const params = await presetStore.get(name);
             
-            if (params) {{
-                Object.keys(params).forEach(id => {{
+            if (params) {
+                const elements = getParamElements();
+                const sliders = [];
+                Object.keys(params).forEach(id => {
                     const value = params[id];
+                    const entry = elements.get(id);
+                    if (!entry) return;
                     
                     // Check if this is an upload field
-                    if (value && typeof value === 'object' && value.isUpload) {{
-                        const selectElement = document.getElementById(id);
-                        if (selectElement && value.selectValue) {{
-                            selectElement.value = value.selectValue;
-                        }}
-                    }} else {{
+                    if (value && typeof value === 'object' && value.isUpload) {
+                        if (entry.upload) entry.upload.restore(value);
+                    } else {
                         // Standard parameter handling
-                        const element = document.getElementById(id);
-                        if (element) {{
-                            if (element.type === 'checkbox') {{
+                        const element = entry.element;
+                        if (element) {
+                            if (element.type === 'checkbox') {
                                 element.checked = value;
-                            }} else {{
+                            } else {
                                 element.value = value;
-                                if (element.type === 'range') {{
-                                    updateSlider(id);
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
-                showStatus(`Preset "${{name}}" loaded!`, 'success');
-            }}
-        }}
+                                if (element.type === 'range') sliders.push(element);
+                            }
+                        }
+                    }
+                });
+                sliders.forEach(syncSlider);
+                if (CONFIG.features.autosave) autosaveParameters();
+                showStatus(`Preset "${name}" loaded!`, 'success');
+            }
+        }
         
-        function deletePreset() {{
+        async function deletePreset() {
             const select = document.getElementById('presetSelect');
             const name = select.value;
             if (!name) return;
             
-            if (!confirm(`Delete preset "${{name}}"?`)) return;
+            if (!confirm(`Delete preset "${name}"?`)) return;
             
-            const presets = JSON.parse(localStorage.getItem('presets') || '{{}}');
-            delete presets[name];
-            localStorage.setItem('presets', JSON.stringify(presets));
+            await presetStore.remove(name);
             
-            loadPresetsList();
-            showStatus(`Preset "${{name}}" deleted`, 'success');
-        }}
+            await loadPresetsList();
+            showStatus(`Preset "${name}" deleted`, 'success');
+        }
         
-        function loadPresetsList() {{
+        async function loadPresetsList() {
             const select = document.getElementById('presetSelect');
             if (!select) return;
             
-            const presets = JSON.parse(localStorage.getItem('presets') || '{{}}');
+            const names = await presetStore.names();
             select.innerHTML = '<option value="">Select preset...</option>';
             
-            Object.keys(presets).forEach(name => {{
+            names.forEach(name => {
                 const option = document.createElement('option');
                 option.value = name;
                 option.textContent = name;
                 select.appendChild(option);
-            }});
-        }}
+            });
+        }
         
         // Batch mode
-        function toggleBatchMode() {{
+        function toggleBatchMode() {
             const checkbox = document.getElementById('batchMode');
             const controls = document.getElementById('batchControls');
-            if (checkbox.checked) {{
+            if (checkbox.checked) {
                 controls.classList.add('active');
-            }} else {{
+            } else {
                 controls.classList.remove('active');
-            }}
-        }}
+            }
+        }
         
         // Generate
-        async function generate() {{
-            const btn = document.getElementById('generateBtn');
-            const spinner = document.getElementById('loadingSpinner');
-            const progressContainer = document.getElementById('progressContainer');
-            
-            // Check batch mode
-            const batchMode = document.getElementById('batchMode')?.checked || false;
-            const batchCount = parseInt(document.getElementById('batchCount')?.value || 1);
+        // Builds the prompt from the current form values. Throws with a
+        // user-facing message when an upload field isn't ready.
+        function buildWorkflow() {
+            const workflow = copyWorkflowTemplate();
             
-            if (batchMode && batchCount > 1) {{
-                await generateBatch(batchCount);
-                return;
-            }}
+            // Update parameters
+            const groups = getParamGroups();
+            const setInput = (param, value) => {
+                const node = workflow[param.node_id];
+                if (node && node.inputs) node.inputs[param.input_name] = value;
+            };
             
-            btn.disabled = true;
-            if (spinner) spinner.classList.add('active');
-            if (progressContainer) progressContainer.classList.add('active');
+            for (const { param, element } of groups.checkboxes) {
+                setInput(param, element.checked);
+            }
+            for (const { param, element } of groups.numbers) {
+                const value = parseFloat(element.value);
+                setInput(param, isNaN(value) ? element.value : value);
+            }
+            for (const { param, element } of groups.strings) {
+                setInput(param, element.value);
+            }
             
-            
-            if (CONFIG.features.progress) {{ connectWebSocket(); updateProgressUI(0, 'Initializing...'); }}
-            try {{
-                // Build workflow
-                const workflow = JSON.parse(JSON.stringify(workflowTemplate));
-                
-                // Update parameters
-                paramMap.forEach(param => {{
-                    let value;
-                    
-                    // Special handling for upload fields (image or audio)
-                    if (param.has_upload) {{
-                        const uploadedInput = document.getElementById(param.id + '_uploaded');
-                        const selectElement = document.getElementById(param.id);
-                        const uploadType = param.upload_type || 'image';
-                        
-                        if (uploadedInput && uploadedInput.value && uploadedInput.dataset.uploaded === 'true') {{
-                            // Use uploaded file name (file was actually uploaded to ComfyUI)
-                            value = uploadedInput.value;
-                            console.log(`{{uploadType === 'audio' ? '🎵' : '🖼️'}} Using uploaded file for ${{param.input_name}}: ${{value}}`);
-                        }} else if (selectElement && selectElement.value) {{
-                            // Use selected value from dropdown
-                            value = selectElement.value;
-                            console.log(`{{uploadType === 'audio' ? '🎵' : '🖼️'}} Using selected file for ${{param.input_name}}: ${{value}}`);
-                        }} else if (uploadedInput && uploadedInput.value) {{
-                            // File was selected but not uploaded - try to upload now
-                            console.warn(`⚠️ File selected but not uploaded for ${{param.input_name}}. Attempting upload...`);
-                            throw new Error(`${{uploadType.charAt(0).toUpperCase() + uploadType.slice(1)}} "{{uploadedInput.value}}" needs to be uploaded first. Please re-select the file.`);
-                        }} else {{
-                            // Fallback to default from workflow template
-                            value = workflow[param.node_id]?.inputs?.[param.input_name] || '';
-                            console.log(`${{uploadType === 'audio' ? '🎵' : '🖼️'}} Using default for ${{param.input_name}}: ${{value}}`);
-                        }}
-                    }} else {{
-                        // Standard parameter handling
-                        const element = document.getElementById(param.id);
-                        if (!element) return;
-                        
-                        if (element.type === 'checkbox') {{
-                            value = element.checked;
-                        }} else if (element.type === 'number' || element.type === 'range') {{
-                            value = parseFloat(element.value);
-                            if (isNaN(value)) value = element.value;
-                        }} else {{
-                            value = element.value;
-                        }}
-                    }}
-                    
-                    if (workflow[param.node_id] && workflow[param.node_id].inputs) {{
-                        workflow[param.node_id].inputs[param.input_name] = value;
-                    }}
-                }});
-                
-                // Validate upload fields
-                let missingUploads = [];
-                let notUploadedUploads = [];
-                paramMap.forEach(param => {{
-                    if (param.has_upload) {{
-                        const uploadedInput = document.getElementById(param.id + '_uploaded');
-                        const selectElement = document.getElementById(param.id);
-                        const hasUploadedFile = uploadedInput && uploadedInput.value && uploadedInput.dataset.uploaded === 'true';
-                        const hasSelectedFile = selectElement && selectElement.value;
-                        const hasFilePendingUpload = uploadedInput && uploadedInput.value && (!uploadedInput.dataset.uploaded || uploadedInput.dataset.uploaded === 'false');
-                        const uploadType = param.upload_type || 'image';
-                        
-                        if (hasFilePendingUpload) {{
-                            notUploadedUploads.push(`${{uploadType.charAt(0).toUpperCase() + uploadType.slice(1)}}: ${{uploadedInput.value}}`);
-                        }} else if (!hasUploadedFile && !hasSelectedFile) {{
-                            missingUploads.push(`${{param.node_title}} → ${{param.input_name}}`);
-                        }}
-                    }}
-                }});
-                
-                if (notUploadedUploads.length > 0) {{
-                    showStatus(`Error: Files not uploaded yet: ${{notUploadedUploads.join(', ')}}. Please wait for upload to complete or re-select.`, 'error');
-                    btn.disabled = false;
-                    if (spinner) spinner.classList.remove('active');
-                    if (progressContainer) progressContainer.classList.remove('active');
-                    return;
-                }}
-                
-                if (missingUploads.length > 0) {{
-                    showStatus(`Error: Please select or upload a file for: ${{missingUploads.join(', ')}}`, 'error');
-                    btn.disabled = false;
-                    if (spinner) spinner.classList.remove('active');
-                    if (progressContainer) progressContainer.classList.remove('active');
-                    return;
-                }}
-                
-                // Apply bypasses
-                bypassToggles.forEach(toggle => {{
-                    const checkbox = document.getElementById(toggle.id);
-                    if (checkbox && checkbox.checked) {{
-                        toggle.nodes.forEach(nodeId => {{
-                            if (workflow[nodeId]) {{
-                                workflow[nodeId].is_bypassed = true;
-                            }}
-                        }});
-                    }}
-                }});
-                
-                console.log('📤 Sending workflow to ComfyUI...');
-                
-                // Submit to ComfyUI
-                const response = await fetch(`${{CONFIG.serverUrl}}/prompt`, {{
-                    method: 'POST',
-                    headers: {{ 'Content-Type': 'application/json' }},
-                    body: JSON.stringify({{ prompt: workflow, client_id: clientId }})
-                }});
+            // Upload fields (image or audio): pick the value and validate in one pass
+            const missingUploads = [];
+            const notUploadedUploads = [];
+            for (const { param, upload } of groups.uploads) {
+                const { source, value } = upload.resolveValue();
                 
-                if (!response.ok) {{
-                    throw new Error(`HTTP ${{response.status}}: ${{response.statusText}}`);
-                }}
-                
-                const result = await response.json();
-                currentPromptId = result.prompt_id;
+                if (source === 'pending') {
+                    notUploadedUploads.push(`${upload.label}: ${value}`);
+                } else if (source === 'missing') {
+                    missingUploads.push(`${param.node_title} → ${param.input_name}`);
+                } else {
+                    dlog(`${upload.icon} Using ${source} file for ${param.input_name}: ${value}`);
+                    setInput(param, value);
+                }
+            }
+            
+            if (notUploadedUploads.length > 0) {
+                throw new Error(`Files not uploaded yet: ${notUploadedUploads.join(', ')}. Please wait for upload to complete or re-select.`);
+            }
+            
+            if (missingUploads.length > 0) {
+                throw new Error(`Please select or upload a file for: ${missingUploads.join(', ')}`);
+            }
+            
+            // Apply bypasses
+            bypassToggles.forEach(toggle => {
+                const checkbox = document.getElementById(toggle.id);
+                if (checkbox && checkbox.checked) {
+                    toggle.nodes.forEach(nodeId => {
+                        if (workflow[nodeId]) {
+                            workflow[nodeId].is_bypassed = true;
+                        }
+                    });
+                }
+            });
+            
+            return workflow;
+        }
+
+        // Queues a prompt with ComfyUI and returns its prompt_id
+        async function submitWorkflow(workflow) {
+            console.log('📤 Sending workflow to ComfyUI...');
+            const response = await fetch(`${CONFIG.serverUrl}/prompt`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ prompt: workflow, client_id: clientId })
+            });
+            
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            
+            const result = await response.json();
+            return result.prompt_id;
+        }
+
+        function setGenerating(active) {
+            const btn = document.getElementById('generateBtn');
+            const spinner = document.getElementById('loadingSpinner');
+            const progressContainer = document.getElementById('progressContainer');
+            
+            if (btn) btn.disabled = active;
+            if (spinner) spinner.classList.toggle('active', active);
+            if (progressContainer) progressContainer.classList.toggle('active', active);
+        }
+
+        async function generate() {
+            // Check batch mode
+            const batchMode = document.getElementById('batchMode')?.checked || false;
+            const batchCount = parseInt(document.getElementById('batchCount')?.value || 1);
+            
+            if (batchMode && batchCount > 1) {
+                await generateBatch(batchCount);
+                return;
+            }
+            
+            setGenerating(true);
+            
+            if (CONFIG.features.progress) { connectWebSocket(); updateProgressUI(0, 'Initializing...'); }
+            try {
+                currentPromptId = await submitWorkflow(buildWorkflow());
                 
                 console.log('✅ Workflow submitted. Prompt ID:', currentPromptId);
                 showStatus('Generation started! Waiting for results...', 'success');
                 
                 // Start polling
-                if (CONFIG.features.progress) {{
+                if (CONFIG.features.progress) {
                     startPolling();
-                }} else {{
-                    setTimeout(() => {{
-                        btn.disabled = false;
+                    // It may have finished before submitWorkflow returned
+                    checkPromptStatus();
+                } else {
+                    setTimeout(() => {
+                        const btn = document.getElementById('generateBtn');
+                        const spinner = document.getElementById('loadingSpinner');
+                        if (btn) btn.disabled = false;
                         if (spinner) spinner.classList.remove('active');
-                    }}, 3000);
-                }}
+                    }, 3000);
+                }
                 
-            }} catch (error) {{
+            } catch (error) {
                 console.error('❌ Generation failed:', error);
-                showStatus(`Error: ${{error.message}}`, 'error');
-                btn.disabled = false;
-                if (spinner) spinner.classList.remove('active');
-                if (progressContainer) progressContainer.classList.remove('active');
-            }}
-        }}
+                showStatus(`Error: ${error.message}`, 'error');
+                setGenerating(false);
+            }
+        }
+        
+        // Resolves with true/false once the given prompt has finished
+        function waitForPrompt(promptId) {
+            return new Promise(resolve => {
+                const originalCallback = window.generationComplete;
+                window.generationComplete = (success) => {
+                    window.generationComplete = originalCallback;
+                    resolve(success);
+                };
+                currentPromptId = promptId;
+                startPolling();
+                // It may have finished while an earlier prompt was being watched
+                checkPromptStatus();
+            });
+        }
         
         // Batch generation
-        async function generateBatch(count) {{
-            showStatus(`Starting batch generation (${{count}} images)...`, 'success');
+        // All prompts are queued with ComfyUI up front, which runs them in
+        // order; the page then follows them one after another.
+        async function generateBatch(count) {
+            showStatus(`Starting batch generation (${count} images)...`, 'success');
             
             const randomizeSeed = document.getElementById('batchRandomSeed')?.checked || false;
             let seedElement = null;
             
             // Find seed parameter
-            if (randomizeSeed) {{
-                for (const param of paramMap) {{
-                    if (param.type === 'seed' || param.input_name.toLowerCase().includes('seed')) {{
+            if (randomizeSeed) {
+                for (const param of paramMap) {
+                    if (param.type === 'seed' || param.input_name.toLowerCase().includes('seed')) {
                         seedElement = document.getElementById(param.id);
                         break;
-                    }}
-                }}
-            }}
+                    }
+                }
+            }
             
-            for (let i = 0; i < count; i++) {{
-                console.log(`📦 Batch ${{i + 1}}/${{count}}`);
-                
-                // Randomize seed if enabled
-                if (randomizeSeed && seedElement) {{
-                    seedElement.value = Math.floor(Math.random() * 999999999999);
-                }}
-                
-                await new Promise((resolve, reject) => {{
-                    const originalCallback = window.generationComplete;
-                    window.generationComplete = (success) => {{
-                        window.generationComplete = originalCallback;
-                        if (success) {{
-                            resolve();
-                        }} else {{
-                            reject(new Error('Generation failed'));
-                        }}
-                    }};
-                    
-                    generate();
-                }});
-                
-                // Wait between generations
-                if (i < count - 1) {{
-                    await new Promise(resolve => setTimeout(resolve, 2000));
-                }}
-            }}
+            setGenerating(true);
+            if (CONFIG.features.progress) { connectWebSocket(); updateProgressUI(0, 'Initializing...'); }
             
-            showStatus(`Batch complete! Generated ${{count}} images.`, 'success');
-        }}
+            const promptIds = [];
+            try {
+                for (let i = 0; i < count; i++) {
+                    // Randomize seed if enabled
+                    if (randomizeSeed && seedElement) {
+                        seedElement.value = randomSeed();
+                    }
+                    promptIds.push(await submitWorkflow(buildWorkflow()));
+                }
+            } catch (error) {
+                console.error('❌ Batch submission failed:', error);
+                showStatus(`Error: ${error.message}`, 'error');
+                if (promptIds.length === 0) {
+                    setGenerating(false);
+                    return;
+                }
+            }
+            
+            let failed = 0;
+            for (let i = 0; i < promptIds.length; i++) {
+                console.log(`📦 Batch ${i + 1}/${promptIds.length}`);
+                setGenerating(true);
+                if (!(await waitForPrompt(promptIds[i]))) failed++;
+            }
+            
+            const done = promptIds.length - failed;
+            showStatus(`Batch complete! Generated ${done} images.`, failed ? 'error' : 'success');
+        }
         
         // Progress polling
-        function startPolling() {{
-            if (pollTimer) clearInterval(pollTimer);
-            
-            pollTimer = setInterval(async () => {{
-                try {{
-                    const response = await fetch(`${{CONFIG.serverUrl}}/history/${{currentPromptId}}`);
-                    if (!response.ok) return;
-                    
-                    const history = await response.json();
-                    const promptData = history[currentPromptId];
-                    
-                    if (promptData) {{
-                        if (promptData.status && promptData.status.status_str === 'success') {{
-                            console.log('✅ Generation complete!');
-                            stopPolling();
-                            handleGenerationComplete(promptData);
-                        }} else if (promptData.status && promptData.status.status_str === 'error') {{
-                            console.error('❌ Generation failed');
-                            stopPolling();
-                            showStatus('Generation failed. Check ComfyUI console.', 'error');
-                        }} else {{
-                            // In progress - if WebSocket isn't updating, keep UI alive
-                            if (Date.now() - lastProgressTs > 1500) {{
-                                updateProgressUI(5, 'Generating...');
-                            }}
-                        }}
-                    }}
-                }} catch (error) {{
-                    console.error('Polling error:', error);
-                }}
-            }}, CONFIG.pollInterval);
-        }}
+        // Waits for the current prompt to finish. The WebSocket tells us when
+        // it is done; /history is polled quickly while the socket is down,
+        // and slowly while it is up in case its completion frame was missed
+        // (a cached prompt can finish before its prompt_id is even known).
+        function startPolling() {
+            watchingPrompt = true;
+            lastHistoryText = null;
+            if (pollTimer) clearTimeout(pollTimer);
+            pollTimer = null;
+            // A socket that is still connecting gets a grace period before
+            // the fast poll starts; its onopen slows the poll down
+            const connecting = ws && ws.readyState === WebSocket.CONNECTING;
+            if (wsConnected) schedulePolling(CONFIG.pollMaxInterval);
+            else schedulePolling(connecting ? CONFIG.wsGracePeriod : CONFIG.pollInterval);
+        }
+
+        // Polls start at CONFIG.pollInterval and back off to
+        // CONFIG.pollMaxInterval; long jobs don't need a check every second
+        let pollDelay = 0;
+        let lastHistoryText = null; // last /history body seen for the current prompt
+
+        function schedulePolling(delay = CONFIG.pollInterval) {
+            pollDelay = delay;
+            pollTimer = setTimeout(pollPromptStatus, pollDelay);
+        }
+
+        async function pollPromptStatus() {
+            pollTimer = null;
+            if (!watchingPrompt) return;
+            await checkPromptStatus();
+            // Stop once finished; with the WebSocket up, stay at the slow rate
+            if (watchingPrompt && !pollTimer) {
+                pollDelay = wsConnected ? CONFIG.pollMaxInterval : Math.min(pollDelay * 2, CONFIG.pollMaxInterval);
+                pollTimer = setTimeout(pollPromptStatus, pollDelay);
+            }
+        }
+
+        async function checkPromptStatus() {
+            const promptId = currentPromptId;
+            try {
+                // Just this prompt's entry, not the whole history
+                const response = await fetch(`${CONFIG.serverUrl}/history/${encodeURIComponent(promptId)}`);
+                if (!response.ok) return;
+                
+                const text = await response.text();
+                // Already finalized by an earlier check, or the same answer as
+                // last time (an unfinished prompt keeps returning {})
+                if (!watchingPrompt || promptId !== currentPromptId) return;
+                if (text === lastHistoryText) return;
+                lastHistoryText = text;
+                
+                const promptData = JSON.parse(text)[promptId];
+                
+                if (promptData) {
+                    if (promptData.status && promptData.status.status_str === 'success') {
+                        console.log('✅ Generation complete!');
+                        stopPolling();
+                        handleGenerationComplete(promptData);
+                    } else if (promptData.status && promptData.status.status_str === 'error') {
+                        console.error('❌ Generation failed');
+                        stopPolling();
+                        showStatus('Generation failed. Check ComfyUI console.', 'error');
+                        if (window.generationComplete) window.generationComplete(false);
+                    } else {
+                        // In progress - if WebSocket isn't updating, keep UI alive
+                        if (Date.now() - lastProgressTs > 1500) {
+                            updateProgressUI(5, 'Generating...');
+                        }
+                    }
+                }
+            } catch (error) {
+                console.error('Polling error:', error);
+            }
+        }
         
-        function stopPolling() {{
-            if (pollTimer) {{
-                clearInterval(pollTimer);
+        function stopPolling() {
+            watchingPrompt = false;
+            if (pollTimer) {
+                clearTimeout(pollTimer);
                 pollTimer = null;
-            }}
-            
-            const btn = document.getElementById('generateBtn');
-            const spinner = document.getElementById('loadingSpinner');
-            const progressContainer = document.getElementById('progressContainer');
+            }
             
-            if (btn) btn.disabled = false;
-            if (spinner) spinner.classList.remove('active');
-            if (progressContainer) progressContainer.classList.remove('active');
-        }}
+            setGenerating(false);
+        }
         
         // Handle generation complete
-        function handleGenerationComplete(promptData) {{
+        function handleGenerationComplete(promptData) {
             showStatus('Generation complete!', 'success');
             
-            if (!CONFIG.features.gallery) {{
+            if (!CONFIG.features.gallery) {
                 if (window.generationComplete) window.generationComplete(true);
                 return;
-            }}
+            }
             
             // Extract outputs
-            const outputs = promptData.outputs || {{}};
+            const outputs = promptData.outputs || {};
             const galleryGrid = document.getElementById('galleryGrid');
             
             // Clear "no images" message
-            if (galleryItems.length === 0) {{
-                galleryGrid.innerHTML = '';
-            }}
+            if (galleryEmpty) galleryEmpty.remove();
             
-            Object.values(outputs).forEach(output => {{
-                if (output.images) {{
-                    output.images.forEach(img => {{
-                        addToGallery(img, 'image');
-                    }});
-                }}
-                if (output.gifs) {{
-                    output.gifs.forEach(gif => {{
-                        addToGallery(gif, 'gif');
-                    }});
-                }}
-                if (output.videos) {{
-                    output.videos.forEach(video => {{
-                        addToGallery(video, 'video');
-                    }});
-                }}
-                if (output.audio) {{
-                    output.audio.forEach(audio => {{
-                        addToGallery(audio, 'audio');
-                    }});
-                }}
-            }});
+            // Collect the new items off-document and insert them in one go
+            const batch = document.createDocumentFragment();
+            Object.values(outputs).forEach(output => {
+                if (output.images) {
+                    output.images.forEach(img => {
+                        addToGallery(img, 'image', true, batch);
+                    });
+                }
+                if (output.gifs) {
+                    output.gifs.forEach(gif => {
+                        addToGallery(gif, 'gif', true, batch);
+                    });
+                }
+                if (output.videos) {
+                    output.videos.forEach(video => {
+                        addToGallery(video, 'video', true, batch);
+                    });
+                }
+                if (output.audio) {
+                    output.audio.forEach(audio => {
+                        addToGallery(audio, 'audio', true, batch);
+                    });
+                }
+            });
+            // Only the new videos need observing, not the whole grid again
+            const newVideos = batch.querySelectorAll('video.video-thumb');
+            galleryGrid.prepend(batch);
+            trimGallery(galleryGrid);
             
-            setupLightbox();
-            initAllVideoThumbnails();
+            // Lightbox and thumbnails can wait until the new items have painted
+            whenIdle(() => {
+                setupLightbox();
+                newVideos.forEach(observeVideoThumbnail);
+            });
             
             if (window.generationComplete) window.generationComplete(true);
-        }}
+        }
         
         // Gallery management
-        function isVideoFile(filename) {{
-            if (!filename) return false;
-            const videoExts = ['.mp4', '.webm', '.mov', '.avi', '.mkv', '.flv', '.wmv', '.m4v', '.3gp', '.ts', '.ogv'];
-            const lower = filename.toLowerCase();
-            // Check for exact match at end
-            for (const ext of videoExts) {{
-                if (lower.endsWith(ext)) return true;
-            }}
-            return false;
-        }}
+        const VIDEO_EXT_RE = /\\.(mp4|webm|mov|avi|mkv|flv|wmv|m4v|3gp|ts|ogv)$/i;
+        const AUDIO_EXT_RE = /\\.(mp3|wav|ogg|flac|aac|m4a|opus|wma|aiff|au)$/i;
 
-        function isAudioFile(filename) {{
-            if (!filename) return false;
-            const audioExts = ['.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a', '.opus', '.wma', '.aiff', '.au'];
-            const lower = filename.toLowerCase();
-            for (const ext of audioExts) {{
-                if (lower.endsWith(ext)) return true;
-            }}
-            return false;
-        }}
+        function isVideoFile(filename) {
+            return !!filename && VIDEO_EXT_RE.test(filename);
+        }
+
+        function isAudioFile(filename) {
+            return !!filename && AUDIO_EXT_RE.test(filename);
+        }
 
-        function addToGallery(file, type, prepend = true) {{
+        // Gallery item markup is parsed once from the page's <template>s and cloned
+        const galleryTemplates = {};
+
+        function cloneGalleryTemplate(id) {
+            if (!galleryTemplates[id]) {
+                galleryTemplates[id] = document.getElementById(id).content.firstElementChild;
+            }
+            return galleryTemplates[id].cloneNode(true);
+        }
+
+        function addToGallery(file, type, prepend = true, target = null) {
             const galleryGrid = document.getElementById('galleryGrid');
             if (!galleryGrid) return;
+            // Batch loads collect items in a DocumentFragment, inserted by the caller
+            const container = target || galleryGrid;
             
             const item = document.createElement('div');
             item.className = 'gallery-item fade-in';
@@ -2841,185 +3531,496 @@ try {{
             // Force type to 'output' for viewing (not 'temp' or other types)
             // This ensures we always get the final output image, not temporary previews
             const viewType = 'output';
-            const url = `${{CONFIG.serverUrl}}/view?filename=${{file.filename}}&type=${{viewType}}&subfolder=${{file.subfolder || ''}}`;
+            const url = `${CONFIG.serverUrl}/view?filename=${encodeURIComponent(file.filename)}&type=${viewType}&subfolder=${encodeURIComponent(file.subfolder || '')}`;
             
             // Auto-detect video and audio files by extension
-            console.log('DEBUG file object:', JSON.stringify(file));
+            dlog('DEBUG file object:', file);
             const filename = file && file.filename ? file.filename : '';
-            console.log('DEBUG filename:', filename, 'type:', type, 'isVideo:', isVideoFile(filename), 'isAudio:', isAudioFile(filename));
             
             // Check if it's a video by filename, regardless of passed type
-            if (isVideoFile(filename)) {{
-                console.log('DEBUG: Converting to video type');
+            if (isVideoFile(filename)) {
+                dlog('DEBUG: Converting to video type:', filename);
                 type = 'video';
-            }}
+            }
             
             // Check if it's an audio file
-            if (isAudioFile(filename)) {{
-                console.log('DEBUG: Converting to audio type');
+            if (isAudioFile(filename)) {
+                dlog('DEBUG: Converting to audio type:', filename);
                 type = 'audio';
-            }}
+            }
             
-            if (type === 'video') {{
-                // Check if we're running from file:// protocol
-                const isFileProtocol = window.location.protocol === 'file:';
-                
-                if (isFileProtocol) {{
-                    // When opened via file://, show a clickable video card instead
-                    item.innerHTML = `
-                        <a href="${{url}}" target="_blank" style="display:block; width:100%; height:100%; text-decoration:none;">
-                            <div style="width:100%; height:100%; display:flex; flex-direction:column; align-items:center; justify-content:center; background:linear-gradient(135deg, #1a1a2e 0%, #16213e 100%); color:#fff; padding:0.5rem; box-sizing:border-box;">
-                                <div style="font-size:3rem; margin-bottom:0.5rem;">🎬</div>
-                                <div style="font-size:0.75rem; text-align:center; word-break:break-word; line-height:1.3; opacity:0.9;">
-                                    <div style="font-weight:600; margin-bottom:0.25rem;">Video</div>
-                                    <div style="font-size:0.65rem; opacity:0.7;">${{file.filename}}</div>
-                                </div>
-                                <div style="margin-top:0.5rem; font-size:0.65rem; background:rgba(99,102,241,0.3); padding:0.25rem 0.5rem; border-radius:12px;">Click to view</div>
-                            </div>
-                        </a>
-                    `;
-                }} else {{
-                    // Normal HTTP/HTTPS - use video element with clickable link wrapper
-                    item.innerHTML = `
-                        <a href="${{url}}" target="_blank" style="display:block; width:100%; height:100%; text-decoration:none; position:relative;">
-                            <div class="video-container" style="width:100%; height:100%; position:relative; background:linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);">
-                                <video class="video-thumb loading" src="${{url}}" muted playsinline preload="auto" crossorigin="anonymous" 
-                                    style="position:absolute; inset:0; width:100%; height:100%; object-fit:cover; pointer-events:none;"
-                                    onloadeddata="this.classList.remove('loading'); console.log('Video loaded:', this.src);"
-                                    onerror="console.error('Video error:', this.src); this.style.display='none'; this.nextElementSibling.style.display='flex';">
-                                </video>
-                                <div class="video-fallback" style="display:none; position:absolute; inset:0; align-items:center; justify-content:center; flex-direction:column; background:inherit; color:#fff; font-size:0.75rem; text-align:center; padding:0.5rem;">
-                                    <div style="font-size:2rem; margin-bottom:0.25rem;">🎬</div>
-                                    <div style="font-size:0.65rem; opacity:0.8; word-break:break-word;">${{file.filename}}</div>
-                                </div>
-                            </div>
-                            <div class="video-overlay">▶</div>
-                            <div class="gallery-item-info">${{file.filename}}</div>
-                        </a>
-                    `;
-                }}
-            }} else if (type === 'audio') {{
-                // Audio files - show clickable audio card
-                item.innerHTML = `
-                    <a href="${{url}}" target="_blank" style="display:block; width:100%; height:100%; text-decoration:none;">
-                        <div style="width:100%; height:100%; display:flex; flex-direction:column; align-items:center; justify-content:center; background:linear-gradient(135deg, #2d1b4e 0%, #1a1a2e 100%); color:#fff; padding:0.5rem; box-sizing:border-box; border-radius:8px;">
-                            <div style="font-size:2.5rem; margin-bottom:0.5rem;">🎵</div>
-                            <div style="font-size:0.75rem; text-align:center; word-break:break-word; line-height:1.3; opacity:0.9;">
-                                <div style="font-weight:600; margin-bottom:0.25rem;">Audio</div>
-                                <div style="font-size:0.65rem; opacity:0.7;">${{file.filename}}</div>
-                            </div>
-                            <div style="margin-top:0.5rem; font-size:0.65rem; background:rgba(139,92,246,0.3); padding:0.25rem 0.5rem; border-radius:12px;">Click to play</div>
-                        </div>
-                    </a>
-                `;
-            }} else {{
-                item.innerHTML = `
-                    <a href="${{url}}" class="glightbox" data-gallery="gallery">
-                        <img src="${{url}}" alt="${{file.filename}}" loading="lazy">
-                        <div class="gallery-item-info">${{file.filename}}</div>
-                    </a>
-                `;
-            }}
+            // file:// pages can't play cross-origin video, so they get a link card
+            let tplId = 'tpl-gallery-image';
+            if (type === 'video') {
+                tplId = window.location.protocol === 'file:' ? 'tpl-gallery-video-fileproto' : 'tpl-gallery-video';
+            } else if (type === 'audio') {
+                tplId = 'tpl-gallery-audio';
+            }
+            const link = cloneGalleryTemplate(tplId);
+            link.href = url;
+            link.querySelectorAll('.filename').forEach(el => { el.textContent = file.filename; });
+            const media = link.querySelector('img, video');
+            if (media && media.tagName === 'IMG') {
+                media.src = url;
+                media.alt = file.filename;
+            } else if (media) {
+                // Loaded once it scrolls into view (observeVideoThumbnail)
+                media.dataset.src = url;
+            }
+            item.appendChild(link);
+            // Lets trimGallery forget the filename when the card goes
+            item.dataset.filename = filename;
             
-            if (prepend) {{
-                galleryGrid.prepend(item);
-                galleryItems.unshift({{ file, type, url }});
-            }} else {{
-                galleryGrid.appendChild(item);
-                galleryItems.push({{ file, type, url }});
-            }}
-
-            // Initialize video thumbnails immediately
-            if (type === 'video') {{
+            if (prepend) {
+                container.prepend(item);
+            } else {
+                container.appendChild(item);
+            }
+            galleryFilenames.add(filename);
+
+            // Initialize video thumbnails immediately; batched items are
+            // observed by the caller once the batch is in the document
+            if (type === 'video' && !target) {
                 const v = item.querySelector('video.video-thumb');
-                if (v) initVideoThumbnail(v);
-            }}
-
-            // Limit gallery size
-            if (galleryItems.length > 50) {{
-                galleryGrid.lastChild.remove();
-                galleryItems.pop();
-            }}
-        }}
+                if (v) observeVideoThumbnail(v);
+            }
+
+            // Batches are trimmed by the caller once they are inserted
+            if (!target) trimGallery(galleryGrid);
+        }
+        
+        // Limit gallery size. The grid is newest-first, so the oldest cards
+        // are its tail and go in one range removal.
+        const GALLERY_LIMIT = 50;
+        
+        function trimGallery(galleryGrid) {
+            const firstDropped = galleryGrid.children[GALLERY_LIMIT];
+            if (!firstDropped) return;
+            for (let card = firstDropped; card; card = card.nextElementSibling) {
+                galleryFilenames.delete(card.dataset.filename);
+            }
+            const range = document.createRange();
+            range.setStartBefore(firstDropped);
+            range.setEndAfter(galleryGrid.lastElementChild);
+            range.deleteContents();
+        }
         
-        function clearGallery() {{
+        function clearGallery() {
             if (!confirm('Clear all gallery items?')) return;
             
             const galleryGrid = document.getElementById('galleryGrid');
-            if (galleryGrid) {{
-                galleryGrid.innerHTML = '<div class="text-center text-muted">No images yet. Click Generate!</div>';
-            }}
-            galleryItems = [];
-        }}
+            if (galleryGrid) {
+                galleryGrid.replaceChildren(...(galleryEmpty ? [galleryEmpty] : []));
+            }
+            galleryFilenames.clear();
+        }
         
-        function setupLightbox() {{
-            if (typeof GLightbox !== 'undefined') {{
-                GLightbox({{
+        // Runs non-urgent work once the browser is idle (at most 500ms later);
+        // Safari has no requestIdleCallback, so it gets the next task instead
+        function whenIdle(fn) {
+            if (window.requestIdleCallback) requestIdleCallback(fn, { timeout: 500 });
+            else setTimeout(fn, 0);
+        }
+
+        // One lightbox for the page; later batches just make it rescan
+        let lightbox = null;
+
+        function setupLightbox() {
+            if (lightbox) {
+                lightbox.reload();
+                return;
+            }
+            if (typeof GLightbox !== 'undefined') {
+                lightbox = GLightbox({
                     selector: '.glightbox',
                     touchNavigation: true,
                     loop: true,
                     autoplayVideos: true
-                }});
-            }}
-        }}
+                });
+            }
+        }
         
         // Status messages
-        function showStatus(message, type = 'success') {{
+        // One hide timer, restarted per message, so an earlier message's
+        // timer can't hide a newer one early
+        let statusTimer = null;
+        
+        function showStatus(message, type = 'success') {
             const statusEl = document.getElementById('statusMessage');
             if (!statusEl) return;
             
             statusEl.textContent = message;
-            statusEl.className = `status-message show ${{type}}`;
+            statusEl.className = `status-message show ${type}`;
             
-            setTimeout(() => {{
+            clearTimeout(statusTimer);
+            statusTimer = setTimeout(() => {
                 statusEl.classList.remove('show');
-            }}, 5000);
-        }}
+            }, 5000);
+        }
         
         // Keyboard shortcuts
-        function setupKeyboardShortcuts() {{
-            document.addEventListener('keydown', function(e) {{
-                // Ctrl+Enter: Generate
-                if (e.ctrlKey && e.key === 'Enter') {{
-                    e.preventDefault();
-                    generate();
-                }}
-                // Ctrl+R: Reset
-                else if (e.ctrlKey && e.key === 'r') {{
-                    e.preventDefault();
-                    resetParameters();
-                }}
-                // Ctrl+S: Save preset
-                else if (e.ctrlKey && e.key === 's') {{
-                    e.preventDefault();
-                    if (CONFIG.features.presets) savePreset();
-                }}
-                // ?: Toggle shortcuts help
-                else if (e.key === '?') {{
-                    toggleShortcutsHelp();
-                }}
-            }});
-        }}
+        // Keyed by (Ctrl ? 'ctrl:' : '') + e.key; Ctrl shortcuts also
+        // suppress the browser's own action (reload, save page)
+        const SHORTCUTS = {
+            'ctrl:Enter': generate,
+            'ctrl:r': resetParameters,
+            // The feature set is fixed when the page is generated; without
+            // presets Ctrl+S is left to the browser
+            ...(CONFIG.features.presets ? { 'ctrl:s': savePreset } : {}),
+            '?': toggleShortcutsHelp
+        };
+
+        function setupKeyboardShortcuts() {
+            document.addEventListener('keydown', function(e) {
+                const action = SHORTCUTS[(e.ctrlKey ? 'ctrl:' : '') + e.key];
+                if (!action) return;
+                if (e.ctrlKey) e.preventDefault();
+                action();
+            });
+        }
         
-        function toggleShortcutsHelp() {{
+        function toggleShortcutsHelp() {
             const help = document.getElementById('shortcutsHelp');
-            if (help) {{
+            if (help) {
                 help.classList.toggle('show');
-            }}
-        }}
+            }
+        }
         
-        console.log('%c🚀 {
-            app_name
-        } Ready!', 'color: #6366f1; font-size: 20px; font-weight: bold;');
+        console.log('%c🚀 ' + CONFIG.appName + ' Ready!', 'color: #6366f1; font-size: 20px; font-weight: bold;');
         console.log('%cPress ? for keyboard shortcuts', 'color: #8b5cf6; font-size: 14px;');
-    </script>
-</body>
-</html>'''
+""".encode("utf-8")
+
+    def _workflow_script(self, workflow):
+        """Workflow JSON embedded in the page. It is the bulk of the dynamic
+        data and only changes with the workflow, so serialize it once."""
+        cached = self._workflow_json
+        if cached is None or cached[0] is not workflow:
+            cached = self._workflow_json = (workflow, _dumps_js(workflow))
+        return cached[1]
+
+    def build_enhanced_html(
+        self, app_name, server_url, output_path, grouped, workflow, features,
+        css_href=None,
+    ):
+        """Build modern, feature-rich HTML, yielded in chunks so it can be
+        written out without ever holding the whole page in one string.
+        With css_href the stylesheet is linked instead of inlined."""
+
+        # Build feature sections conditionally
+        preset_section = ""
+        if features["presets"]:
+            preset_section = """
+                    <div class="preset-section mb-3">
+                        <label><i class="fas fa-save me-2"></i>Presets</label>
+                        <div class="preset-controls">
+                            <select id="presetSelect" onchange="loadPreset()">
+                                <option value="">Select preset...</option>
+                            </select>
+                            <button onclick="savePreset()" title="Save current settings"><i class="fas fa-plus"></i></button>
+                            <button onclick="deletePreset()" title="Delete selected preset"><i class="fas fa-trash"></i></button>
+                        </div>
+                    </div>
+"""
 
-        return html
+        batch_section = ""
+        if features["batch"]:
+            batch_section = """
+                    <div class="batch-section mb-3">
+                        <label class="d-flex align-items-center">
+                            <input type="checkbox" id="batchMode" onchange="toggleBatchMode()" class="me-2">
+                            <i class="fas fa-layer-group me-2"></i>Batch Mode
+                        </label>
+                        <div class="batch-controls" id="batchControls">
+                            <label>Number of generations:</label>
+                            <input type="number" id="batchCount" value="3" min="1" max="20" class="form-control">
+                            <label class="mt-2">
+                                <input type="checkbox" id="batchRandomSeed" checked class="me-2">
+                                Randomize seed each time
+                            </label>
+                        </div>
+                    </div>
+"""
+
+        progress_section = ""
+        if features["progress"]:
+            progress_section = """
+                    <div class="progress-container" id="progressContainer">
+                        <div class="progress-bar-custom">
+                            <div class="progress-bar-fill" id="progressBar">0%</div>
+                        </div>
+                        <p class="text-center mt-2 mb-0" id="progressText">Initializing...</p>
+                    </div>
+"""
+
+        theme_toggle = ""
+        if features["dark_mode"]:
+            theme_toggle = '<button class="theme-toggle" onclick="toggleTheme()"><i class="fas fa-moon"></i> <span id="theme-text">Dark</span></button>'
+
+        shortcuts_toggle = ""
+        if features["keyboard"]:
+            shortcuts_toggle = '<button class="theme-toggle" onclick="toggleShortcutsHelp()"><i class="fas fa-keyboard"></i> Shortcuts</button>'
+
+        gallery_section = ""
+        if features["gallery"]:
+            gallery_section = """
+                <div class="gallery">
+                    <div class="d-flex justify-content-between align-items-center mb-3">
+                        <h3 class="mb-0"><i class="fas fa-images me-2"></i>Gallery</h3>
+                        <div>
+                            <button onclick="clearGallery()" class="btn-sm btn-outline-danger" title="Clear gallery">
+                                <i class="fas fa-trash"></i>
+                            </button>
+                        </div>
+                    </div>
+                    <div class="gallery-grid" id="galleryGrid">
+                        <div class="text-center text-muted" id="galleryEmpty">No images yet. Click Generate!</div>
+                    </div>
+                </div>
+                <!-- Gallery item markup, cloned by addToGallery -->
+                <template id="tpl-gallery-image">
+                    <a class="glightbox" data-gallery="gallery">
+                        <img loading="lazy" decoding="async">
+                        <div class="gallery-item-info filename"></div>
+                    </a>
+                </template>
+                <template id="tpl-gallery-video">
+                    <a target="_blank" style="display:block; width:100%; height:100%; text-decoration:none; position:relative;">
+                        <div class="video-container" style="width:100%; height:100%; position:relative; background:linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);">
+                            <video class="video-thumb loading" muted playsinline preload="none" crossorigin="anonymous"
+                                style="position:absolute; inset:0; width:100%; height:100%; object-fit:cover; pointer-events:none;"
+                                onloadeddata="this.classList.remove('loading'); dlog('Video loaded:', this.src);"
+                                onerror="console.error('Video error:', this.src); this.style.display='none'; this.nextElementSibling.style.display='flex';">
+                            </video>
+                            <div class="video-fallback" style="display:none; position:absolute; inset:0; align-items:center; justify-content:center; flex-direction:column; background:inherit; color:#fff; font-size:0.75rem; text-align:center; padding:0.5rem;">
+                                <div style="font-size:2rem; margin-bottom:0.25rem;">🎬</div>
+                                <div class="filename" style="font-size:0.65rem; opacity:0.8; word-break:break-word;"></div>
+                            </div>
+                        </div>
+                        <div class="video-overlay">▶</div>
+                        <div class="gallery-item-info filename"></div>
+                    </a>
+                </template>
+                <template id="tpl-gallery-video-fileproto">
+                    <a target="_blank" style="display:block; width:100%; height:100%; text-decoration:none;">
+                        <div style="width:100%; height:100%; display:flex; flex-direction:column; align-items:center; justify-content:center; background:linear-gradient(135deg, #1a1a2e 0%, #16213e 100%); color:#fff; padding:0.5rem; box-sizing:border-box;">
+                            <div style="font-size:3rem; margin-bottom:0.5rem;">🎬</div>
+                            <div style="font-size:0.75rem; text-align:center; word-break:break-word; line-height:1.3; opacity:0.9;">
+                                <div style="font-weight:600; margin-bottom:0.25rem;">Video</div>
+                                <div class="filename" style="font-size:0.65rem; opacity:0.7;"></div>
+                            </div>
+                            <div style="margin-top:0.5rem; font-size:0.65rem; background:rgba(99,102,241,0.3); padding:0.25rem 0.5rem; border-radius:12px;">Click to view</div>
+                        </div>
+                    </a>
+                </template>
+                <template id="tpl-gallery-audio">
+                    <a target="_blank" style="display:block; width:100%; height:100%; text-decoration:none;">
+                        <div style="width:100%; height:100%; display:flex; flex-direction:column; align-items:center; justify-content:center; background:linear-gradient(135deg, #2d1b4e 0%, #1a1a2e 100%); color:#fff; padding:0.5rem; box-sizing:border-box; border-radius:8px;">
+                            <div style="font-size:2.5rem; margin-bottom:0.5rem;">🎵</div>
+                            <div style="font-size:0.75rem; text-align:center; word-break:break-word; line-height:1.3; opacity:0.9;">
+                                <div style="font-weight:600; margin-bottom:0.25rem;">Audio</div>
+                                <div class="filename" style="font-size:0.65rem; opacity:0.7;"></div>
+                            </div>
+                            <div style="margin-top:0.5rem; font-size:0.65rem; background:rgba(139,92,246,0.3); padding:0.25rem 0.5rem; border-radius:12px;">Click to play</div>
+                        </div>
+                    </a>
+                </template>
+"""
+
+        shortcuts_help = ""
+        if features["keyboard"]:
+            # Ctrl+S is only bound when presets are on
+            save_row = (
+                "\n        <p><kbd>Ctrl</kbd> + <kbd>S</kbd> - Save Preset</p>"
+                if features["presets"]
+                else ""
+            )
+            shortcuts_help = f"""
+    <div class="shortcuts-help" id="shortcutsHelp">
+        <h4>Keyboard Shortcuts</h4>
+        <p><kbd>Ctrl</kbd> + <kbd>Enter</kbd> - Generate</p>
+        <p><kbd>Ctrl</kbd> + <kbd>R</kbd> - Reset</p>{save_row}
+        <p><kbd>?</kbd> - Toggle this help</p>
+    </div>
+"""
+
+        # Generate complete HTML
+        page_title = escape(app_name)
+        yield f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="description" content="{page_title} - Professional ComfyUI Interface">
+    <meta name="generator" content="ComfyUI HTML Generator v{self.VERSION}">
+    <title>{page_title}</title>
+    
+    <!-- Bootstrap 5 CSS -->
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
+    <!-- Font Awesome -->
+    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
+    <!-- GLightbox for image viewer -->
+    <link href="https://cdn.jsdelivr.net/npm/glightbox@3.2.0/dist/css/glightbox.min.css" rel="stylesheet">
+    
+    <!-- Library scripts: fetched while the page parses, run before DOMContentLoaded -->
+    <script defer src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
+    <script defer src="https://cdn.jsdelivr.net/npm/glightbox@3.2.0/dist/js/glightbox.min.js"></script>
+    
+'''
+        if css_href:
+            yield f'    <link href="{css_href}" rel="stylesheet">\n'
+        else:
+            yield "    <style>\n"
+            yield self._STATIC_CSS
+            yield "    </style>\n"
+        yield f'''</head>
+<body>
+    <!-- Header -->
+    <header class="app-header">
+        <div class="container-fluid">
+            <div class="d-flex justify-content-between align-items-center">
+                <h1><i class="fas fa-magic me-2"></i>{page_title}</h1>
+                <div class="header-controls">
+                    {theme_toggle}
+                    {shortcuts_toggle}
+                </div>
+            </div>
+        </div>
+    </header>
+    
+    <!-- Main Content -->
+    <div class="main-container">
+        <div class="status-message" id="statusMessage"></div>
+        
+        <div class="content-grid">
+            <!-- Left: Parameters -->
+            <div class="parameters-section" id="parametersSection">
+                '''
+
+        # Parameter inputs, streamed one category section at a time
+        param_map = []
+        bypass_toggles = []
+        tooltips_on = features["tooltips"]
+        # Looked up once, not per parameter; workflows can have hundreds
+        render_row = _PARAM_ROW_TMPL.format_map
+        input_html = self.generate_input_html
+        add_param = param_map.append
+
+        # `grouped` comes in already sorted by category
+        for category, params in grouped.items():
+            bypass_id, section_open = _category_skeleton(category)
+
+            # Unique node ids in first-seen order, so the page is reproducible
+            cat_nodes = {p["node_id"]: None for p in params}
+            bypass_toggles.append({"id": bypass_id, "nodes": list(cat_nodes)})
+
+            yield section_open
+
+            for param in params:
+                param_id = _param_id_prefix(param["node_id"]) + param["input_name"]
+                add_param(
+                    {
+                        "id": param_id,
+                        "node_id": param["node_id"],
+                        "input_name": param["input_name"],
+                        "type": param["type"],
+                        "has_upload": param.get("has_upload", False),
+                        "upload_type": param.get("upload_type", None),
+                    }
+                )
+
+                tooltip_html = ""
+                if tooltips_on and param["description"]:
+                    tooltip_html = f'<span class="info-icon" title="{escape(param["description"])}">ℹ️</span>'
+
+                yield render_row(
+                    {
+                        "pid": escape(param_id),
+                        "title": escape(param["node_title"]),
+                        "iname": escape(param["input_name"]),
+                        "tip": tooltip_html,
+                        "input_html": input_html(param, param_id),
+                    }
+                )
+
+            yield _CATEGORY_CLOSE
+
+        yield f'''
+            </div>
+            
+            <!-- Right: Controls & Gallery -->
+            <div class="sidebar">
+                <!-- Control Panel -->
+                <div class="control-panel">
+                    <h3 class="mb-3"><i class="fas fa-sliders-h me-2"></i>Controls</h3>
+                    
+                    {preset_section}
+                    
+                    {batch_section}
+                    
+                    <button class="btn-primary" onclick="generate()" id="generateBtn">
+                        <i class="fas fa-play me-2"></i>Generate
+                    </button>
+                    
+                    <button class="btn-secondary" onclick="resetParameters()">
+                        <i class="fas fa-undo me-2"></i>Reset All
+                    </button>
+                    
+                    {progress_section}
+                    
+                    <div class="spinner" id="loadingSpinner"></div>
+                </div>
+                
+                <!-- Gallery -->
+                {gallery_section}
+            </div>
+        </div>
+    </div>
+    
+    <!-- Keyboard Shortcuts Help -->
+    {shortcuts_help}
+    
+    <!-- Page data as JSON, which parses much faster than the same object literals -->
+    <script id="workflow-data" type="application/json">{self._workflow_script(workflow)}</script>
+    <script id="param-map-data" type="application/json">{_dumps_js(param_map)}</script>
+    <script id="bypass-toggles-data" type="application/json">{_dumps_js(bypass_toggles)}</script>
+    
+    <script>
+        // Configuration
+        const CONFIG = {{
+            serverUrl: {_dumps_js(server_url)},
+            outputPath: {_dumps_js(output_path)},
+            features: {_dumps_js(features)},
+            debug: {_dumps_js(_DEBUG)},
+            pollInterval: 1000,
+            pollMaxInterval: 4000,
+            wsGracePeriod: 2000,
+            appName: {_dumps_js(app_name)},
+            version: {_dumps_js(self.VERSION)}
+        }};
+        
+        function readPageData(id) {{
+            return JSON.parse(document.getElementById(id).textContent);
+        }}
+        
+        // Parameter mapping
+        const paramMap = readPageData('param-map-data');
+        
+        // Bypass toggles
+        const bypassToggles = readPageData('bypass-toggles-data');
+        
+'''
+        yield self._STATIC_JS
+        yield b"""    </script>
+</body>
+</html>"""
 
     def generate_input_html(self, param, param_id):
-        """Generate appropriate HTML input for parameter type"""
+        """Generate appropriate HTML input for parameter type.
+
+        Builders get the id already escaped; they escape the value themselves
+        where it is written out as text, since toggles and sliders still need
+        the raw bool/number."""
+        param_id = escape(param_id)
         value = param["value"]
         ptype = param["type"]
         options = param.get("options")
@@ -3033,123 +4034,107 @@ try {{
         ):
             ptype = "dropdown"
 
-        if ptype in ["image_upload", "audio_upload"]:
-            # Image/audio upload widget with dropdown for existing files
-            # Check if current value exists in options
-            value_exists = options and str(value) in [str(opt) for opt in options]
-
-            options_html = "".join(
-                [
-                    f'<option value="{opt}" {"selected" if str(opt) == str(value) else ""}>{opt}</option>'
-                    for opt in (options or [])
-                ]
+        if ptype in ("slider", "slider_small"):
+            return self._input_slider(param_id, ptype, value, options, upload_type, param.get("limits"))
+
+        build = self._INPUT_BUILDERS.get(ptype, SmartWorkflowGenerator._input_text)
+        return build(self, param_id, ptype, value, options, upload_type)
+
+    def _input_upload(self, param_id, ptype, value, options, upload_type):
+        """Upload button plus a picker for files already in ComfyUI's input folder"""
+        # Image/audio upload widget with dropdown for existing files
+        # Check if current value exists in options
+        value_exists = options and str(value) in map(str, options)
+        text = escape(str(value))
+
+        select_html = ""
+        if options:
+            select_html = _UPLOAD_SELECT_TMPL.format(
+                pid=param_id,
+                value=text,
+                selected_value=text if value_exists else "",
+                upload_type=upload_type,
+                placeholder_selected="" if value_exists else "selected",
+                options=_options_html(options, value),
             )
 
+        return _UPLOAD_WIDGET_TMPL.format(
+            pid=param_id,
+            upload_type=upload_type,
+            upload_label=upload_type.capitalize(),
+            accept=".jpg,.jpeg,.png,.gif" if upload_type == "image" else ".mp3,.wav,.ogg,.m4a,.aac",
+            select=select_html,
             # Warning if value doesn't exist in options
-            warning_html = ""
-            if value and not value_exists:
-                warning_html = f'<div class="text-warning small mt-1">⚠️ Warning: Selected file "{value}" not found in input folder</div>'
-
-            return f'''
-                <div class="image-upload-widget">
-                    <div class="input-group mb-2">
-                        <input type="file" id="{
-                param_id
-            }_file" class="form-control d-none" accept="{
-                ".jpg,.jpeg,.png,.gif"
-                if upload_type == "image"
-                else ".mp3,.wav,.ogg,.m4a,.aac"
-            }" 
-                        onchange="handleUpload('{param_id}', this, '{upload_type}')">
-                        <button class="btn btn-outline-primary" type="button" onclick="document.getElementById('{
-                param_id
-            }_file').click()">
-                            <i class="fas fa-upload"></i> Upload {
-                upload_type.capitalize()
-            }
-                        </button>
-                        {
-                f"""<select id="{param_id}" class="form-control" data-default="{value}" value="{value if value_exists else ""}"
-                                onchange="handleSelect('{param_id}', this.value, '{upload_type}'); autosaveParameters()">
-                            <option value="" disabled {"selected" if not value_exists else ""}>Select existing {upload_type}...</option>
-                            {options_html}
-                        </select>"""
-                if options
-                else ""
-            }
-                    </div>
-                    {warning_html}
-                    <div id="{
-                param_id
-            }_preview" class="image-preview-container mt-2" style="display: none;">
-                        {
-                f'<img id="{param_id}_preview_img" src="" alt="Preview" style="max-width: 200px; max-height: 150px; border-radius: 8px;">'
-                if upload_type == "image"
-                else ""
-            }
-                        {
-                f'<audio id="{param_id}_preview_audio" controls style="width: 100%; margin-top: 10px;"></audio>'
-                if upload_type == "audio"
-                else ""
-            }
-                    <button class="btn btn-sm btn-outline-danger mt-1" onclick="clearUpload('{
-                param_id
-            }', '{upload_type}')">
-                            <i class="fas fa-times"></i> Clear
-                        </button>
-                    </div>
-                    <input type="hidden" id="{param_id}_uploaded" value="">
-                </div>
-            '''
+            warning=_UPLOAD_MISSING_TMPL.format(value=text) if value and not value_exists else "",
+            preview_img=_UPLOAD_PREVIEW_IMG_TMPL.format(pid=param_id) if upload_type == "image" else "",
+            preview_audio=_UPLOAD_PREVIEW_AUDIO_TMPL.format(pid=param_id) if upload_type == "audio" else "",
+        )
 
-        elif ptype == "dropdown" and options:
-            options_html = "".join(
-                [
-                    f'<option value="{opt}" {"selected" if str(opt) == str(value) else ""}>{opt}</option>'
-                    for opt in options
-                ]
-            )
-            return f'<select id="{param_id}" class="form-control" data-default="{value}" onchange="autosaveParameters()">{options_html}</select>'
+    def _input_dropdown(self, param_id, ptype, value, options, upload_type):
+        if not options:
+            return self._input_text(param_id, ptype, value, options, upload_type)
+        options_html = _options_html(options, value)
+        return f'<select id="{param_id}" class="form-control" data-default="{escape(str(value))}" data-autosave="1">{options_html}</select>'
 
-        elif ptype == "toggle":
-            checked = "checked" if value else ""
-            return f'''
+    def _input_toggle(self, param_id, ptype, value, options, upload_type):
+        checked = "checked" if value else ""
+        return f'''
                 <label class="toggle-switch">
-                    <input type="checkbox" id="{param_id}" {checked} data-default="{value}" onchange="autosaveParameters()">
+                    <input type="checkbox" id="{param_id}" {checked} data-default="{value}" data-autosave="1">
                     <span class="slider-toggle"></span>
                 </label>
             '''
 
-        elif ptype == "seed":
-            return f'''
+    def _input_seed(self, param_id, ptype, value, options, upload_type):
+        """Number input with a randomise button"""
+        text = escape(str(value))
+        return f'''
                 <div class="input-group">
-                    <input type="number" id="{param_id}" value="{value}" class="form-control" data-default="{value}" onchange="autosaveParameters()">
-                    <button class="btn btn-outline-secondary" onclick="document.getElementById('{param_id}').value = Math.floor(Math.random() * 999999999999); autosaveParameters();">
+                    <input type="number" id="{param_id}" value="{text}" class="form-control" data-default="{text}" data-autosave="1">
+                    <button class="btn btn-outline-secondary" type="button" data-action="reseed" data-param="{param_id}">
                         <i class="fas fa-random"></i>
                     </button>
                 </div>
             '''
 
-        elif ptype in ["slider", "slider_small"]:
-            min_val = 0
-            max_val = 100 if ptype == "slider" else 2
-            step = 0.1 if isinstance(value, float) else 1
-            return f'''
+    def _input_slider(self, param_id, ptype, value, options, upload_type, limits=None):
+        """Range input, bounded by the node's declared min/max/step where the API gives them"""
+        limits = limits or {}
+        min_val = limits.get("min", 0)
+        max_val = limits.get("max", 100 if ptype == "slider" else 2)
+        step = limits.get("step", 0.1 if isinstance(value, float) else 1)
+        return f'''
                 <div class="slider-container">
                     <input type="range" id="{param_id}" min="{min_val}" max="{max_val}" step="{step}" value="{value}" 
-                           oninput="updateSlider('{param_id}')" data-default="{value}">
+                           data-kind="slider" data-default="{value}">
                     <span class="slider-value" id="{param_id}_value">{value}</span>
                 </div>
             '''
 
-        elif ptype == "number":
-            return f'<input type="number" id="{param_id}" value="{value}" class="form-control" data-default="{value}" onchange="autosaveParameters()">'
-
-        elif ptype == "textarea":
-            return f'<textarea id="{param_id}" rows="5" class="form-control" data-default="{value}" onchange="autosaveParameters()">{value}</textarea>'
-
-        else:  # text, path, file_selector
-            return f'<input type="text" id="{param_id}" value="{value}" class="form-control" data-default="{value}" onchange="autosaveParameters()">'
+    def _input_number(self, param_id, ptype, value, options, upload_type):
+        text = escape(str(value))
+        return f'<input type="number" id="{param_id}" value="{text}" class="form-control" data-default="{text}" data-autosave="1">'
+
+    def _input_textarea(self, param_id, ptype, value, options, upload_type):
+        text = escape(str(value))
+        return f'<textarea id="{param_id}" rows="5" class="form-control" data-default="{text}" data-autosave="1">{text}</textarea>'
+
+    def _input_text(self, param_id, ptype, value, options, upload_type):
+        """text, path, file_selector and anything unrecognised"""
+        text = escape(str(value))
+        return f'<input type="text" id="{param_id}" value="{text}" class="form-control" data-default="{text}" data-autosave="1">'
+
+    # Input widget builder per param type (sliders are built separately, as
+    # they also need the API limits); anything else is a text box
+    _INPUT_BUILDERS = {
+        "image_upload": _input_upload,
+        "audio_upload": _input_upload,
+        "dropdown": _input_dropdown,
+        "toggle": _input_toggle,
+        "seed": _input_seed,
+        "number": _input_number,
+        "textarea": _input_textarea,
+    }
 
 
 # Gradio Interface
@@ -3292,7 +4277,7 @@ def create_interface():
         - Generated HTML works completely standalone
         - Uses Bootstrap 5 + modern CSS
         - Dark mode auto-saves preference
-        - Presets stored in browser localStorage
+        - Presets stored in the browser (IndexedDB, or localStorage where it is unavailable)
         - Gallery shows last 50 generations
         - Keyboard shortcuts: Ctrl+Enter (generate), Ctrl+R (reset), Ctrl+S (save preset)
         